@@ -0,0 +1,402 @@
+"""
+HTTP JSON API for the numerology calculator (plain ASGI, no framework needed).
+
+Endpoints:
+    GET  /health                      -> {"status": "ok"}
+    POST /calculate                   -> one record: {"name", "birth_date", "with_log"?, "interpretations"?}
+    POST /calculate/batch             -> {"records": [{"name", "birth_date"}, ...]}
+    GET  /interpretations/{number}    -> text for "5", "11", "23/5", ...
+    GET  /metrics                     -> request latency histograms (Prometheus text format),
+                                         plus per-stage timings when instrumentation is enabled
+
+Batch bodies are decoded and validated in a worker process, then split into chunks
+that are calculated and JSON-encoded in the process pool, so the event loop never
+blocks on CPU work; it only joins the encoded chunks. Run with any ASGI server, e.g.:
+    uvicorn api_service:app --port 8000
+For local testing without a server use InProcessClient:
+    client = InProcessClient(app)
+    status, body = client.post('/calculate', {'name': 'Jane Doe', 'birth_date': '1990-05-17'})
+"""
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numerology_calculator_patched as nc
+import interpretations_store
+import instrumentation
+
+BATCH_CHUNK_SIZE = 5000
+MAX_BATCH_SIZE = 100000
+MAX_BODY_SIZE = 16 * 1024 * 1024
+MAX_RECORD_BODY_SIZE = 64 * 1024 # Bodies of the single-record endpoint are decoded inline
+INTERPRETATIONS_CSV = os.environ.get('NUMEROLOGY_INTERPRETATIONS_CSV', 'interpretations.csv')
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class HttpError(Exception):
+    """Raised by handlers to return a JSON error response."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+    def __reduce__(self): # Raised in worker processes too
+        return HttpError, (self.status, self.message)
+
+
+# --- Metrics ---
+
+class LatencyHistogram:
+    """Cumulative latency histogram with Prometheus-style buckets."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+
+    def snapshot(self):
+        """Cumulative counts per bucket bound (plus '+Inf'), count and sum."""
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative['+Inf'] = self.count
+        return {'buckets': cumulative, 'count': self.count, 'sum': self.total}
+
+
+class RequestMetrics:
+    """Latency histograms keyed by (route, status)."""
+
+    def __init__(self):
+        self.histograms = {}
+
+    def observe(self, route, status, seconds):
+        key = (route, status)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    def snapshot(self):
+        return [{'route': route, 'status': status, **histogram.snapshot()}
+                for (route, status), histogram in sorted(self.histograms.items())]
+
+    def prometheus_text(self):
+        lines = ["# HELP numerology_http_request_duration_seconds HTTP request latency.",
+                 "# TYPE numerology_http_request_duration_seconds histogram"]
+        for entry in self.snapshot():
+            labels = f'route="{entry["route"]}",status="{entry["status"]}"'
+            for bound, count in entry['buckets'].items():
+                lines.append(f'numerology_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'numerology_http_request_duration_seconds_count{{{labels}}} {entry["count"]}')
+            lines.append(f'numerology_http_request_duration_seconds_sum{{{labels}}} {entry["sum"]:.6f}')
+        return "\n".join(lines) + "\n"
+
+
+# --- Calculation helpers (module level so worker processes can pickle them) ---
+
+def _result_json(result):
+    """JSON form of one calculator result (dict or NumerologyResult)."""
+    data = {'number': result['number'], 'sum': result['sum']}
+    if 'log' in result:
+        data['log'] = result['log']
+    return data
+
+
+def calculate_records(records):
+    """Calculates a list of (name, birth_date) pairs with the batch engine."""
+    names = [name for name, _ in records]
+    dates = [birth_date for _, birth_date in records]
+    results = nc.calculate_all_numerology_batch(names, dates)
+    columns = {number_name: (results[number_name]['number'].tolist(), results[number_name]['sum'].tolist())
+               for number_name in nc.NUMBER_TYPES}
+    return [
+        {number_name: {'number': columns[number_name][0][i], 'sum': columns[number_name][1][i]}
+         for number_name in nc.NUMBER_TYPES}
+        for i in range(len(records))
+    ]
+
+
+def calculate_records_json(first_row, names, birth_dates):
+    """
+    Calculates one chunk of a batch and returns it as encoded JSON list items
+    (comma-separated, no brackets), ready to be joined with the other chunks.
+    """
+    results = calculate_records(list(zip(names, birth_dates)))
+    if len(results) != len(names):
+        raise ValueError(f"Chunk at record {first_row} returned {len(results)} results for {len(names)} records")
+    return json.dumps(results, ensure_ascii=False)[1:-1].encode('utf-8')
+
+
+def _decode_json(body):
+    try:
+        return json.loads(body or b'{}')
+    except ValueError:
+        raise HttpError(400, "Request body must be valid JSON")
+
+
+def parse_batch_body(body, chunk_size):
+    """
+    Decodes and validates a /calculate/batch body. Returns the records as
+    [(first_row, names, birth_dates), ...] chunks of at most chunk_size records.
+    """
+    request = _decode_json(body)
+    records = request.get('records') if isinstance(request, dict) else None
+    if not isinstance(records, list):
+        raise HttpError(400, "'records' must be a list of {name, birth_date} objects")
+    if len(records) > MAX_BATCH_SIZE:
+        raise HttpError(413, f"At most {MAX_BATCH_SIZE} records per batch")
+    names = []
+    birth_dates = []
+    for i, record in enumerate(records):
+        name, birth_date = _parse_record(record, i)
+        names.append(name)
+        birth_dates.append(birth_date)
+    return [(i, names[i:i + chunk_size], birth_dates[i:i + chunk_size]) for i in range(0, len(names), chunk_size)]
+
+
+def _parse_record(record, position=None):
+    """Validates one {"name", "birth_date"} object and returns (name, birth_date)."""
+    where = f" (record {position})" if position is not None else ""
+    if not isinstance(record, dict):
+        raise HttpError(400, f"Each record must be a JSON object{where}")
+    name = record.get('name')
+    birth_date = record.get('birth_date')
+    if not isinstance(name, str) or not name.strip():
+        raise HttpError(400, f"'name' must be a non-empty string{where}")
+    if not isinstance(birth_date, str):
+        raise HttpError(400, f"'birth_date' must be a YYYY-MM-DD string{where}")
+    return name, birth_date
+
+
+# --- Application ---
+
+class NumerologyApi:
+    """The ASGI application."""
+
+    def __init__(self, workers=None, chunk_size=BATCH_CHUNK_SIZE, interpretations_csv=INTERPRETATIONS_CSV):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.interpretations_csv = interpretations_csv
+        self.metrics = RequestMetrics()
+        self._pool = None
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('POST', '/calculate'): self.calculate,
+            ('POST', '/calculate/batch'): self.calculate_batch,
+            ('GET', '/metrics'): self.metrics_endpoint,
+        }
+
+    # Worker pool lifecycle
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    # ASGI entry point
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        started = time.perf_counter()
+        method = scope['method']
+        path = scope['path'].rstrip('/') or '/'
+        route = 'unmatched' # Unknown paths share one label to keep metrics bounded
+        try:
+            handler, argument, route = self._resolve(method, path)
+            body = await self._read_body(receive)
+            status, payload, content_type = await handler(body, argument)
+        except HttpError as e:
+            status, payload, content_type = e.status, {'error': e.message}, 'application/json'
+        except Exception as e:
+            status, payload, content_type = 500, {'error': f"Internal error: {e}"}, 'application/json'
+
+        if isinstance(payload, bytes): # Already encoded by the handler
+            data = payload
+        elif content_type == 'application/json':
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        else:
+            data = payload.encode('utf-8')
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', f"{content_type}; charset=utf-8".encode('ascii')),
+                                (b'content-length', str(len(data)).encode('ascii'))]})
+        await send({'type': 'http.response.body', 'body': data})
+        self.metrics.observe(route, status, time.perf_counter() - started)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _resolve(self, method, path):
+        """Returns (handler, path argument, route label) or raises 404/405."""
+        if path.startswith('/interpretations/'):
+            if method != 'GET':
+                raise HttpError(405, "Method not allowed")
+            return self.interpretation, path[len('/interpretations/'):], '/interpretations/{number}'
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                raise HttpError(405, "Method not allowed")
+            raise HttpError(404, "Not found")
+        return handler, None, path
+
+    async def _read_body(self, receive):
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > MAX_BODY_SIZE:
+                raise HttpError(413, "Request body too large")
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    def _store(self):
+        try:
+            return interpretations_store.get_store(self.interpretations_csv)
+        except (OSError, ValueError):
+            return None
+
+    # Handlers: each returns (status, payload, content type)
+
+    async def health(self, body, argument):
+        return 200, {'status': 'ok'}, 'application/json'
+
+    async def calculate(self, body, argument):
+        if len(body) > MAX_RECORD_BODY_SIZE:
+            raise HttpError(413, "Request body too large; use /calculate/batch for many records")
+        request = _decode_json(body)
+        name, birth_date = _parse_record(request)
+        with_log = bool(request.get('with_log', False))
+        results = nc.calculate_all_numerology(name, birth_date, with_log=with_log, as_record=True)
+        response = {number_name: _result_json(results[number_name]) for number_name in nc.NUMBER_TYPES}
+
+        if request.get('interpretations'):
+            store = self._store()
+            for number_name in nc.NUMBER_TYPES:
+                number = response[number_name]['number']
+                if store is not None and number not in ('Error', 'Invalid Input'):
+                    response[number_name]['interpretations'] = store.render(number)
+        return 200, response, 'application/json'
+
+    async def calculate_batch(self, body, argument):
+        # Decoding, validation, calculation and encoding all run in the pool
+        loop = asyncio.get_running_loop()
+        chunks = await loop.run_in_executor(self.pool, parse_batch_body, body, self.chunk_size)
+        futures = [loop.run_in_executor(self.pool, calculate_records_json, first_row, names, birth_dates)
+                   for first_row, names, birth_dates in chunks]
+        encoded = await asyncio.gather(*futures)
+        count = sum(len(names) for _, names, _ in chunks)
+        data = b''.join([b'{"count": %d, "results": [' % count, b', '.join(encoded), b']}'])
+        return 200, data, 'application/json'
+
+    async def interpretation(self, body, number):
+        store = self._store()
+        if store is None:
+            raise HttpError(503, "Interpretations are not available")
+        initial_part, final_part = interpretations_store.get_numerology_parts(number)
+        if final_part is None or not final_part.isdigit():
+            raise HttpError(404, f"'{number}' is not a number string such as '5', '11' or '23/5'")
+        if final_part not in store: # e.g. '0', '05' or numbers without a CSV entry
+            raise HttpError(404, f"No interpretation for '{number}'")
+        blocks = store.render(number)
+        return 200, {'number': number, 'placeholder': store.is_placeholder(final_part),
+                     'blocks': blocks}, 'application/json'
+
+    async def metrics_endpoint(self, body, argument):
+        text = self.metrics.prometheus_text()
+        if instrumentation.enabled:
+            text += instrumentation.prometheus_text()
+        return 200, text, 'text/plain; version=0.0.4'
+
+
+app = NumerologyApi()
+
+
+# --- In-process client for local testing ---
+
+class InProcessClient:
+    """Calls an ASGI app directly, without a server or sockets."""
+
+    def __init__(self, asgi_app):
+        self.app = asgi_app
+
+    async def request_async(self, method, path, json_body=None):
+        body = json.dumps(json_body).encode('utf-8') if json_body is not None else b''
+        scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+                 'path': path, 'raw_path': path.encode('utf-8'), 'query_string': b'', 'headers': []}
+        received = False
+        response = {}
+        chunks = []
+
+        async def receive():
+            nonlocal received
+            if received:
+                return {'type': 'http.disconnect'}
+            received = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['headers'] = dict(message['headers'])
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+
+        await self.app(scope, receive, send)
+        data = b''.join(chunks)
+        if response['headers'].get(b'content-type', b'').startswith(b'application/json'):
+            return response['status'], json.loads(data)
+        return response['status'], data.decode('utf-8')
+
+    def request(self, method, path, json_body=None):
+        """Synchronous request; returns (status, parsed JSON or text)."""
+        return asyncio.run(self.request_async(method, path, json_body))
+
+    def get(self, path):
+        return self.request('GET', path)
+
+    def post(self, path, json_body):
+        return self.request('POST', path, json_body)
+
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("Serving requires an ASGI server, e.g. pip install uvicorn")
+    uvicorn.run(app, host=os.environ.get('HOST', '127.0.0.1'), port=int(os.environ.get('PORT', '8000')))
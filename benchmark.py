@@ -0,0 +1,293 @@
+"""
+Benchmark suite for the calculator hot paths.
+
+Measures single-call latency and bulk throughput for each calculator, the batch
+engine, interpretation loading and report rendering over seeded synthetic corpora
+(varying name length and Y density), saves the results as a JSON baseline, and
+compares two result files to flag regressions.
+
+Example:
+    python benchmark.py run --output baseline.json
+    python benchmark.py run --output current.json --quick
+    python benchmark.py compare baseline.json current.json --threshold 0.10
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+import numerology_calculator_patched as nc
+import interpretations_store
+import report_renderer
+
+CONSONANTS = 'BCDFGHJKLMNPQRSTVWXZ'
+VOWEL_LETTERS = 'AEIOU'
+NAME_LENGTHS = {'short': (4, 12), 'medium': (15, 30), 'long': (40, 80)}
+Y_DENSITIES = {'no_y': 0.0, 'some_y': 0.1, 'many_y': 0.3}
+
+
+# --- Corpora ---
+
+def make_name(rng, length, y_density):
+    """One synthetic name of about `length` letters, split into words, with some Ys."""
+    letters = []
+    for _ in range(length):
+        roll = rng.random()
+        if roll < y_density:
+            letters.append('Y')
+        elif roll < y_density + (1 - y_density) * 0.4:
+            letters.append(rng.choice(VOWEL_LETTERS))
+        else:
+            letters.append(rng.choice(CONSONANTS))
+        if rng.random() < 0.15:
+            letters.append(' ')
+    return ''.join(letters).strip().title()
+
+
+def make_names(count, length_range, y_density, seed=0):
+    rng = random.Random(seed)
+    return [make_name(rng, rng.randint(*length_range), y_density) for _ in range(count)]
+
+
+def make_dates(count, seed=0):
+    rng = random.Random(seed)
+    start = datetime.date(1900, 1, 1).toordinal()
+    end = datetime.date(2025, 12, 31).toordinal() # Fixed so corpora never change
+    return [datetime.date.fromordinal(rng.randint(start, end)).isoformat() for _ in range(count)]
+
+
+# --- Timing helpers ---
+
+def time_per_call(func, repeat=5):
+    """Best-of-`repeat` seconds per call, with the loop count picked by timeit.autorange."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def time_once(func, repeat=3):
+    """Best-of-`repeat` seconds for a single (expensive) call."""
+    return min(timeit.Timer(func).repeat(repeat=repeat, number=1))
+
+
+def latency(seconds):
+    return {'kind': 'latency', 'unit': 's/call', 'value': seconds}
+
+
+def throughput(rows, seconds):
+    return {'kind': 'throughput', 'unit': 'rows/s', 'value': rows / seconds if seconds > 0 else 0.0}
+
+
+# --- Benchmarks ---
+
+def bench_calculators(results, corpus_size, repeat):
+    """Single-call latency and bulk throughput of every calculator per corpus."""
+    dates = make_dates(corpus_size, seed=1)
+    corpora = [(length_label, length_range, y_label, y_density)
+               for length_label, length_range in NAME_LENGTHS.items()
+               for y_label, y_density in Y_DENSITIES.items()]
+    for seed, (length_label, length_range, y_label, y_density) in enumerate(corpora, start=100):
+        corpus = f"{length_label}/{y_label}"
+        names = make_names(corpus_size, length_range, y_density, seed=seed)
+        sample = names[0]
+
+        for label, func in (('calculate_expression', nc.calculate_expression),
+                            ('calculate_soul_urge', nc.calculate_soul_urge),
+                            ('calculate_personality', nc.calculate_personality),
+                            ('analyze_name', nc.analyze_name)):
+            results[f"{label}[{corpus}].latency"] = latency(time_per_call(lambda: func(sample), repeat))
+            results[f"{label}[{corpus}].throughput"] = throughput(
+                len(names), time_once(lambda: [func(name) for name in names], repeat))
+
+        results[f"calculate_all_numerology[{corpus}].latency"] = latency(
+            time_per_call(lambda: nc.calculate_all_numerology(sample, dates[0]), repeat))
+        results[f"calculate_all_numerology[{corpus}].throughput"] = throughput(
+            len(names), time_once(lambda: [nc.calculate_all_numerology(n, d) for n, d in zip(names, dates)], repeat))
+        results[f"calculate_all_numerology_nolog[{corpus}].throughput"] = throughput(
+            len(names), time_once(lambda: [nc.calculate_all_numerology(n, d, with_log=False)
+                                           for n, d in zip(names, dates)], repeat))
+        results[f"calculate_all_numerology_batch[{corpus}].throughput"] = throughput(
+            len(names), time_once(lambda: nc.calculate_all_numerology_batch(names, dates), repeat))
+
+        y_positions = [(name.upper(), i) for name in names[:200] for i, c in enumerate(name.upper()) if c == 'Y']
+        if y_positions:
+            results[f"is_y_vowel[{corpus}].throughput"] = throughput(
+                len(y_positions), time_per_call(lambda: [nc.is_y_vowel(n, i) for n, i in y_positions], repeat))
+
+    sample_date = dates[0]
+    results["calculate_life_path[str].latency"] = latency(time_per_call(lambda: nc.calculate_life_path(sample_date), repeat))
+    date_obj = datetime.date.fromisoformat(sample_date)
+    results["calculate_life_path[date].latency"] = latency(time_per_call(lambda: nc.calculate_life_path(date_obj), repeat))
+    results["calculate_life_path.throughput"] = throughput(
+        len(dates), time_once(lambda: [nc.calculate_life_path(d) for d in dates], repeat))
+    results["calculate_life_path_batch.throughput"] = throughput(
+        len(dates), time_once(lambda: nc.calculate_life_path_batch(dates), repeat))
+
+
+def bench_reduction(results, corpus_size, repeat):
+    """reduce_number latency over typical sums and batch reduction throughput."""
+    rng = random.Random(2)
+    sums = [rng.randint(0, 2000) for _ in range(corpus_size)]
+    results["reduce_number.latency"] = latency(time_per_call(lambda: nc.reduce_number(1234), repeat))
+    results["reduce_number.throughput"] = throughput(
+        len(sums), time_once(lambda: [nc.reduce_number(s) for s in sums], repeat))
+    sums_array = np.array(sums, dtype=np.int64)
+    results["reduce_number_batch.throughput"] = throughput(
+        len(sums), time_per_call(lambda: nc.reduce_number_batch(sums_array), repeat))
+
+
+def bench_interpretations(results, csv_path, repeat):
+    """CSV parsing/compiling, cold loading of the compiled store, and report rendering."""
+    workdir = tempfile.mkdtemp(prefix='numerology-bench-')
+    try:
+        local_csv = os.path.join(workdir, 'interpretations.csv')
+        shutil.copyfile(csv_path, local_csv)
+        results["interpretations.parse_csv.latency"] = latency(
+            time_once(lambda: interpretations_store.read_interpretations_csv(local_csv), repeat))
+        results["interpretations.build_store.latency"] = latency(
+            time_once(lambda: interpretations_store.build_store(local_csv), repeat))
+
+        def cold_load():
+            interpretations_store.load_store(local_csv).close()
+        results["interpretations.load_compiled.latency"] = latency(time_once(cold_load, repeat))
+
+        store = interpretations_store.load_store(local_csv)
+        names = make_names(1000, NAME_LENGTHS['medium'], 0.1, seed=3)
+        dates = make_dates(1000, seed=3)
+
+        renderer = report_renderer.ReportRenderer(store)
+
+        def render_report(name, birth_date):
+            return renderer.markdown(renderer.report(name, birth_date))
+
+        results["report.render.latency"] = latency(time_per_call(lambda: render_report(names[0], dates[0]), repeat))
+        results["report.render.throughput"] = throughput(
+            len(names), time_once(lambda: [render_report(n, d) for n, d in zip(names, dates)], repeat))
+        store.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_benchmarks(corpus_size=2000, repeat=5, csv_path='interpretations.csv', with_cache=False):
+    """Runs every benchmark and returns the result document."""
+    # Caches would turn repeated calls into lookups; measure the raw paths unless asked
+    if not with_cache:
+        nc.configure_caches(0, 0, 0)
+    results = {}
+    try:
+        bench_reduction(results, corpus_size, repeat)
+        bench_calculators(results, corpus_size, repeat)
+        if os.path.exists(csv_path):
+            bench_interpretations(results, csv_path, repeat)
+    finally:
+        nc.configure_caches()
+    return {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'corpus_size': corpus_size,
+            'repeat': repeat,
+            'with_cache': with_cache,
+        },
+        'results': results,
+    }
+
+
+# --- Comparison ---
+
+def compare_results(baseline, current, threshold=0.10):
+    """
+    Compares two result documents. Returns a list of (name, baseline value, current
+    value, change, status) rows, where change > 0 always means slower and status is
+    'regression', 'improvement', 'ok', 'new' or 'missing'.
+    """
+    rows = []
+    base_results = baseline['results']
+    current_results = current['results']
+    for name in sorted(set(base_results) | set(current_results)):
+        if name not in current_results:
+            rows.append((name, base_results[name]['value'], None, None, 'missing'))
+            continue
+        if name not in base_results:
+            rows.append((name, None, current_results[name]['value'], None, 'new'))
+            continue
+        old = base_results[name]['value']
+        new = current_results[name]['value']
+        if current_results[name]['kind'] == 'latency':
+            change = (new - old) / old if old else 0.0
+        else:
+            change = (old - new) / new if new else float('inf')
+        if change > threshold:
+            status = 'regression'
+        elif change < -threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append((name, old, new, change, status))
+    return rows
+
+
+def print_comparison(rows, out=sys.stdout):
+    width = max((len(row[0]) for row in rows), default=10)
+    for name, old, new, change, status in rows:
+        old_text = f"{old:.4g}" if old is not None else '-'
+        new_text = f"{new:.4g}" if new is not None else '-'
+        change_text = f"{change:+.1%}" if change is not None else ''
+        marker = '!!' if status == 'regression' else '  '
+        print(f"{marker} {name:<{width}}  {old_text:>12}  {new_text:>12}  {change_text:>8}  {status}", file=out)
+
+
+def load_results(path):
+    with open(path, mode='r', encoding='utf-8') as infile:
+        return json.load(infile)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Numerology calculator benchmarks.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Run the benchmarks and save the results as JSON")
+    run_parser.add_argument('--output', '-o', default='bench_results.json')
+    run_parser.add_argument('--corpus-size', type=int, default=2000, help="Names/dates per corpus (default: 2000)")
+    run_parser.add_argument('--repeat', type=int, default=5, help="Repetitions; the best is kept (default: 5)")
+    run_parser.add_argument('--quick', action='store_true', help="Small corpora and fewer repetitions")
+    run_parser.add_argument('--with-cache', action='store_true', help="Keep the name/date caches enabled")
+    run_parser.add_argument('--interpretations', default='interpretations.csv')
+
+    compare_parser = subparsers.add_parser('compare', help="Compare two result files and flag regressions")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="Relative slowdown that counts as a regression (default: 0.10)")
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        corpus_size, repeat = (200, 2) if args.quick else (args.corpus_size, args.repeat)
+        document = run_benchmarks(corpus_size, repeat, args.interpretations, args.with_cache)
+        with open(args.output, mode='w', encoding='utf-8') as outfile:
+            json.dump(document, outfile, indent=2, sort_keys=True)
+        print(f"Saved {len(document['results'])} results to {args.output}")
+        return 0
+
+    rows = compare_results(load_results(args.baseline), load_results(args.current), args.threshold)
+    print_comparison(rows)
+    regressions = [row for row in rows if row[4] == 'regression']
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,354 @@
+"""
+Bulk numerology calculator for CSV/JSONL exports.
+
+Streams (name, birth_date) records from a CSV or JSONL file, calculates the core
+numbers with calculate_all_numerology in a process pool, and writes the results
+incrementally to CSV, JSONL or Parquet.
+
+Example:
+    python bulk_cli.py clients.csv results.jsonl --workers 8 --chunk-size 5000
+    python bulk_cli.py clients.csv results.jsonl --resume   # continue after a crash
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numerology_calculator_patched as nc
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+
+
+def output_columns(with_log=False):
+    """Returns the output column names in order."""
+    columns = ['row', 'name', 'birth_date']
+    for prefix in nc.NUMBER_TYPES.values(): # Output column order follows nc.NUMBER_TYPES
+        columns += [prefix, f"{prefix}_sum"]
+        if with_log:
+            columns.append(f"{prefix}_log")
+    return columns
+
+
+def detect_format(path, explicit=None):
+    """Picks the file format from an explicit option or the file extension."""
+    if explicit:
+        return explicit
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension == 'json':
+        extension = 'jsonl'
+    if extension not in FORMATS:
+        raise ValueError(f"Cannot tell the format of '{path}'; use --input-format/--output-format")
+    return extension
+
+
+# --- Input ---
+
+def _field_text(value):
+    """JSON field as the string the calculators expect (numbers etc. as their str(), null as '')."""
+    return '' if value is None else str(value)
+
+
+def read_records(path, input_format, name_field='name', date_field='birth_date'):
+    """Yields (name, birth_date) tuples from a CSV or JSONL file, one at a time."""
+    with open(path, mode='r', encoding='utf-8', newline='') as infile:
+        if input_format == 'csv':
+            reader = csv.DictReader(infile)
+            if not reader.fieldnames or name_field not in reader.fieldnames or date_field not in reader.fieldnames:
+                raise ValueError(f"CSV file '{path}' must contain '{name_field}' and '{date_field}' columns")
+            for row in reader:
+                yield row[name_field] or '', row[date_field] or ''
+        elif input_format == 'jsonl':
+            for line in infile:
+                if line.strip():
+                    record = json.loads(line)
+                    yield _field_text(record.get(name_field)), _field_text(record.get(date_field))
+        else:
+            raise ValueError(f"Unsupported input format: {input_format}")
+
+
+def chunk_records(records, chunk_size, start_row=0):
+    """Groups records into (first_row_number, [records]) chunks."""
+    row = start_row
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return
+        yield row, chunk
+        row += len(chunk)
+
+
+# --- Calculation (runs in worker processes) ---
+
+def calculate_chunk(first_row, chunk, engine='batch', with_log=False):
+    """Calculates one chunk of records and returns a list of output rows (dicts)."""
+    names = [name for name, _ in chunk]
+    dates = [birth_date for _, birth_date in chunk]
+    rows = [{'row': first_row + i, 'name': name, 'birth_date': birth_date}
+            for i, (name, birth_date) in enumerate(chunk)]
+
+    if engine == 'batch' and not with_log:
+        results = nc.calculate_all_numerology_batch(names, dates)
+        for number_name, prefix in nc.NUMBER_TYPES.items():
+            numbers = results[number_name]['number'].tolist()
+            sums = results[number_name]['sum'].tolist()
+            for row, number, total in zip(rows, numbers, sums):
+                row[prefix] = number
+                row[f"{prefix}_sum"] = total
+        return rows
+
+    for row, name, birth_date in zip(rows, names, dates):
+        results = nc.calculate_all_numerology(name, birth_date, with_log=with_log, as_record=True)
+        for number_name, prefix in nc.NUMBER_TYPES.items():
+            result = results[number_name]
+            row[prefix] = result.number
+            row[f"{prefix}_sum"] = result.sum
+            if with_log:
+                row[f"{prefix}_log"] = result.log
+    return rows
+
+
+def map_chunks(function, chunks, workers, *args):
+    """
+    Yields function(first_row, chunk, *args) for every chunk, in input order. With
+    more than one worker the chunks run in a process pool (function must be a
+    module-level function) with at most 2 * workers chunks in flight at once, so
+    memory stays bounded no matter how large the input is.
+    """
+    if workers <= 1:
+        for first_row, chunk in chunks:
+            yield function(first_row, chunk, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for first_row, chunk in chunks:
+            pending.append(pool.submit(function, first_row, chunk, *args))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def calculate_chunks(chunks, workers, engine='batch', with_log=False):
+    """Yields calculated chunks in input order (see map_chunks)."""
+    return map_chunks(calculate_chunk, chunks, workers, engine, with_log)
+
+
+def print_progress(progress, done, processed, started, unit='rows'):
+    """Prints '<done> <unit> done (<rate> <unit>/sec)'; the rate counts items processed since started."""
+    elapsed = time.perf_counter() - started
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print(f"{done} {unit} done ({rate:,.0f} {unit}/sec)", file=progress)
+
+
+# --- Output ---
+
+class CsvWriter:
+    """Writes result rows to a CSV file."""
+
+    def __init__(self, path, columns, append=False):
+        write_header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self.file = open(path, mode='a' if append else 'w', encoding='utf-8', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=columns)
+        if write_header:
+            self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def tell(self):
+        """Size of the output in bytes after the last write."""
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlWriter:
+    """Writes result rows to a JSON Lines file."""
+
+    def __init__(self, path, columns, append=False):
+        self.columns = columns
+        self.file = open(path, mode='a' if append else 'w', encoding='utf-8')
+
+    def write(self, rows):
+        self.file.writelines(
+            json.dumps({column: row[column] for column in self.columns}, ensure_ascii=False) + "\n"
+            for row in rows
+        )
+        self.file.flush()
+
+    def tell(self):
+        """Size of the output in bytes after the last write."""
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """Writes result rows to a Parquet file, one row group per chunk (needs pyarrow)."""
+
+    def __init__(self, path, columns, append=False):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet output requires the 'pyarrow' package (pip install pyarrow)")
+        if append:
+            raise RuntimeError("Parquet files cannot be appended to; resume into a new output file "
+                               "with --start-offset instead")
+        fields = []
+        for column in columns:
+            if column == 'row' or column.endswith('_sum'):
+                fields.append(pyarrow.field(column, pyarrow.int64()))
+            else:
+                fields.append(pyarrow.field(column, pyarrow.string()))
+        self.pyarrow = pyarrow
+        self.columns = columns
+        self.schema = pyarrow.schema(fields)
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        data = {column: [row[column] for row in rows] for column in self.columns}
+        self.writer.write_table(self.pyarrow.Table.from_pydict(data, schema=self.schema))
+
+    def tell(self):
+        return None # Parquet output is never resumed in place
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {'csv': CsvWriter, 'jsonl': JsonlWriter, 'parquet': ParquetWriter}
+
+
+# --- Checkpointing ---
+
+def checkpoint_path(output_path):
+    """Path of the file recording how many input rows have been written."""
+    return output_path + '.checkpoint'
+
+
+def read_checkpoint(output_path):
+    """
+    Returns (rows_done, output_bytes): the number of input rows already written and
+    the output size in bytes after them (None if unknown). (0, None) without a checkpoint.
+    """
+    try:
+        with open(checkpoint_path(output_path), mode='r', encoding='utf-8') as infile:
+            data = json.load(infile)
+    except FileNotFoundError:
+        return 0, None
+    return int(data['rows_done']), data.get('output_bytes')
+
+
+def write_checkpoint(output_path, rows_done, output_bytes=None):
+    """Records progress atomically so a crash never leaves a half-written checkpoint."""
+    path = checkpoint_path(output_path)
+    with open(path + '.tmp', mode='w', encoding='utf-8') as outfile:
+        json.dump({'rows_done': rows_done, 'output_bytes': output_bytes}, outfile)
+    os.replace(path + '.tmp', path)
+
+
+def prepare_resume(output_path):
+    """
+    Reads the checkpoint and truncates the output to the size it records, dropping
+    anything written after it (rows of a chunk that was not checkpointed, or a partial
+    last line). Returns the number of input rows done.
+    """
+    rows_done, output_bytes = read_checkpoint(output_path)
+    if rows_done and output_bytes is not None:
+        size = os.path.getsize(output_path)
+        if size < output_bytes:
+            raise ValueError(f"'{output_path}' is shorter than its checkpoint records; cannot resume")
+        if size > output_bytes:
+            with open(output_path, mode='r+b') as outfile:
+                outfile.truncate(output_bytes)
+    return rows_done
+
+
+# --- Main ---
+
+def run(input_path, output_path, input_format=None, output_format=None, workers=None,
+        chunk_size=10000, start_offset=0, append=False, engine='batch', with_log=False,
+        name_field='name', date_field='birth_date', progress=sys.stderr):
+    """
+    Processes input_path into output_path and returns the number of rows written.
+    Input rows before start_offset are skipped; with append=True results are added
+    to an existing output file (used when resuming).
+    """
+    input_format = detect_format(input_path, input_format)
+    output_format = detect_format(output_path, output_format)
+    workers = workers or os.cpu_count() or 1
+
+    records = read_records(input_path, input_format, name_field, date_field)
+    records = itertools.islice(records, start_offset, None)
+    chunks = chunk_records(records, chunk_size, start_row=start_offset)
+
+    writer = WRITERS[output_format](output_path, output_columns(with_log), append=append)
+    written = 0
+    started = time.perf_counter()
+    try:
+        for rows in calculate_chunks(chunks, workers, engine, with_log):
+            writer.write(rows)
+            written += len(rows)
+            write_checkpoint(output_path, start_offset + written, writer.tell())
+            if progress:
+                print_progress(progress, start_offset + written, written, started)
+    finally:
+        writer.close()
+
+    if progress:
+        elapsed = time.perf_counter() - started
+        rate = written / elapsed if elapsed > 0 else 0.0
+        print(f"Finished: {written} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)", file=progress)
+    return written
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Calculate numerology numbers for a CSV/JSONL file of people.")
+    parser.add_argument('input', help="Input file (.csv or .jsonl) with name and birth date fields")
+    parser.add_argument('output', help="Output file (.csv, .jsonl or .parquet)")
+    parser.add_argument('--input-format', choices=('csv', 'jsonl'))
+    parser.add_argument('--output-format', choices=FORMATS)
+    parser.add_argument('--name-field', default='name', help="Name column/key (default: name)")
+    parser.add_argument('--date-field', default='birth_date', help="Birth date column/key, YYYY-MM-DD (default: birth_date)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Records per batch (default: 10000)")
+    parser.add_argument('--engine', choices=('batch', 'scalar'), default='batch',
+                        help="batch = vectorized NumPy engine, scalar = calculate_all_numerology per row")
+    parser.add_argument('--log', action='store_true', help="Include calculation logs (uses the scalar engine)")
+    resume = parser.add_mutually_exclusive_group()
+    resume.add_argument('--start-offset', type=int, default=0, help="Skip this many input rows")
+    resume.add_argument('--resume', action='store_true',
+                        help="Continue from the output's checkpoint file and append to the output")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    start_offset = args.start_offset
+    append = False
+    try:
+        if args.resume:
+            start_offset = prepare_resume(args.output)
+            append = start_offset > 0
+            print(f"Resuming from row {start_offset}", file=sys.stderr)
+        run(args.input, args.output, args.input_format, args.output_format, args.workers,
+            args.chunk_size, start_offset, append, args.engine, args.log,
+            args.name_field, args.date_field)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+All-pairs compatibility scoring between two populations.
+
+Every person's numbers are calculated once with the batch engine and reduced to a
+small integer code per number type (the final part of "23/5" is 5, "11" stays 11).
+Pair scores are then weighted lookups in a compatibility table, computed as NumPy
+gathers over memory-bounded tiles, so N x M comparisons never call the scalar
+calculators and never hold more than one tile per worker in memory.
+
+Example:
+    left = compute_profiles(client_names, client_dates)
+    right = compute_profiles(candidate_names, candidate_dates)
+    indexes, scores = top_k_matches(left, right, k=10, workers=8)
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import numerology_calculator_patched as nc
+
+DEFAULT_WEIGHTS = {number_type: 0.25 for number_type in nc.NUMBER_TYPES}
+
+MAX_NUMBER = 99
+MISSING_CODE = MAX_NUMBER + 1 # Row/column of zeros in every table ('Error' results)
+TABLE_SIZE = MISSING_CODE + 1
+
+# Number families used by the default table: mental, material and creative numbers
+NUMBER_FAMILIES = ({1, 5, 7}, {2, 4, 8}, {3, 6, 9})
+DEFAULT_TILE_SIZE = 2048
+
+
+# --- Compatibility tables ---
+
+def number_root(number):
+    """Reduces a number to a single digit (11 -> 2, 22 -> 4, 0 stays 0)."""
+    while number > 9:
+        number = nc.sum_digits(number)
+    return number
+
+
+def build_compatibility_table(scores, default=0.5, symmetric=True):
+    """
+    Builds a (TABLE_SIZE, TABLE_SIZE) float32 table from {(a, b): score} with numbers
+    0..MAX_NUMBER. Unlisted pairs get `default`; the MISSING_CODE row/column stays 0.
+    """
+    table = np.full((TABLE_SIZE, TABLE_SIZE), default, dtype=np.float32)
+    for (a, b), score in scores.items():
+        table[a, b] = score
+        if symmetric:
+            table[b, a] = score
+    table[MISSING_CODE, :] = 0.0
+    table[:, MISSING_CODE] = 0.0
+    return table
+
+
+def default_compatibility_table():
+    """
+    Default table: numbers whose roots share a family score 1.0, identical numbers 0.9
+    otherwise, everything else 0.5. Master numbers use their root (11 -> 2, ...).
+    """
+    scores = {}
+    for a in range(1, MAX_NUMBER + 1):
+        for b in range(1, MAX_NUMBER + 1):
+            root_a, root_b = number_root(a), number_root(b)
+            if any(root_a in family and root_b in family for family in NUMBER_FAMILIES):
+                scores[(a, b)] = 1.0
+            elif a == b:
+                scores[(a, b)] = 0.9
+    return build_compatibility_table(scores)
+
+
+def _check_table(table):
+    table = np.asarray(table, dtype=np.float32)
+    if table.shape != (TABLE_SIZE, TABLE_SIZE):
+        raise ValueError(f"Compatibility table must have shape ({TABLE_SIZE}, {TABLE_SIZE})")
+    return table
+
+
+# --- Profiles ---
+
+def final_number_code(num_str):
+    """Integer code of a calculated number string: '23/5' -> 5, '11' -> 11, 'Error' -> MISSING_CODE."""
+    final_part = num_str.rsplit('/', 1)[-1] if isinstance(num_str, str) else ''
+    if final_part.isdigit() and int(final_part) <= MAX_NUMBER:
+        return int(final_part)
+    return MISSING_CODE
+
+
+class Profiles:
+    """Number codes of a population: an (n, 4) int array in nc.NUMBER_TYPES order."""
+
+    def __init__(self, codes):
+        self.codes = np.ascontiguousarray(codes, dtype=np.int64)
+        if self.codes.ndim != 2 or self.codes.shape[1] != len(nc.NUMBER_TYPES):
+            raise ValueError(f"Profile codes must have shape (n, {len(nc.NUMBER_TYPES)})")
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return Profiles(self.codes[index])
+
+
+def compute_profiles(names, birth_dates):
+    """Calculates everyone's numbers once (batch engine) and returns their Profiles."""
+    batch = nc.calculate_all_numerology_columns(names, birth_dates)
+    columns = []
+    for number_type in nc.NUMBER_TYPES:
+        column = batch[number_type]
+        codes = np.array([final_number_code(value) for value in column.categories], dtype=np.int64)
+        columns.append(codes[column.code] if len(codes) else np.zeros(0, dtype=np.int64))
+    return Profiles(np.stack(columns, axis=1) if columns[0].size else np.zeros((0, len(nc.NUMBER_TYPES))))
+
+
+# --- Scoring ---
+
+class _Scorer:
+    """Precomputed weighted table rows for the left population."""
+
+    def __init__(self, left, table, weights):
+        table = _check_table(default_compatibility_table() if table is None else table)
+        weights = DEFAULT_WEIGHTS if weights is None else weights
+        total_weight = sum(weights.get(t, 0.0) for t in nc.NUMBER_TYPES)
+        if total_weight <= 0:
+            raise ValueError("At least one number type needs a positive weight")
+        self.types = [(i, np.float32(weights[t] / total_weight)) for i, t in enumerate(nc.NUMBER_TYPES)
+                      if weights.get(t, 0.0) > 0]
+        # Weighted table rows per type for every left person: (n_left, TABLE_SIZE)
+        self.rows = {i: table[left.codes[:, i]] * w for i, w in self.types}
+
+    def tile(self, row_start, row_stop, right_codes):
+        """Scores for left rows [row_start, row_stop) against every right person given."""
+        scores = None
+        for i, _ in self.types:
+            part = np.take(self.rows[i][row_start:row_stop], right_codes[:, i], axis=1)
+            if scores is None:
+                scores = part
+            else:
+                scores += part
+        return scores
+
+
+def iter_compatibility_tiles(left, right, table=None, weights=None, tile_size=DEFAULT_TILE_SIZE):
+    """
+    Yields (row_start, col_start, scores) tiles covering the full len(left) x len(right)
+    score matrix; each tile is at most tile_size x tile_size float32.
+    """
+    scorer = _Scorer(left, table, weights)
+    for row_start in range(0, len(left), tile_size):
+        row_stop = min(row_start + tile_size, len(left))
+        for col_start in range(0, len(right), tile_size):
+            col_stop = min(col_start + tile_size, len(right))
+            yield row_start, col_start, scorer.tile(row_start, row_stop, right.codes[col_start:col_stop])
+
+
+def compatibility_matrix(left, right, table=None, weights=None, tile_size=DEFAULT_TILE_SIZE):
+    """Full score matrix (float32, len(left) x len(right)). Use top_k_matches for large inputs."""
+    matrix = np.empty((len(left), len(right)), dtype=np.float32)
+    for row_start, col_start, scores in iter_compatibility_tiles(left, right, table, weights, tile_size):
+        matrix[row_start:row_start + scores.shape[0], col_start:col_start + scores.shape[1]] = scores
+    return matrix
+
+
+def _keep_top_k(scores, indexes, k):
+    """
+    Keeps the first k columns per row by (highest score, lowest right index). Columns
+    are in ascending index order and stay so, which breaks ties at the k-th score
+    the same way for every tile size (the default table has few distinct scores).
+    """
+    threshold = -np.partition(-scores, k - 1, axis=1)[:, k - 1:k]
+    above = scores > threshold
+    at = scores == threshold
+    needed = k - above.sum(axis=1, keepdims=True)
+    keep = above | (at & (np.cumsum(at, axis=1) <= needed))
+    rows = len(scores)
+    return scores[keep].reshape(rows, k), indexes[keep].reshape(rows, k)
+
+
+def _top_k_block(left_codes, right_codes, k, table, weights, tile_size):
+    """Top-k matches (k <= len(right_codes)) for a block of left rows, streaming over right tiles."""
+    left = Profiles(left_codes)
+    scorer = _Scorer(left, table, weights)
+    n = len(left)
+    best_scores = np.empty((n, k), dtype=np.float32)
+    best_indexes = np.empty((n, k), dtype=np.int64)
+    for row_start in range(0, n, tile_size):
+        row_stop = min(row_start + tile_size, n)
+        block_scores = np.empty((row_stop - row_start, 0), dtype=np.float32)
+        block_indexes = np.empty((row_stop - row_start, 0), dtype=np.int64)
+        for col_start in range(0, len(right_codes), tile_size):
+            scores = scorer.tile(row_start, row_stop, right_codes[col_start:col_start + tile_size])
+            indexes = np.broadcast_to(np.arange(col_start, col_start + scores.shape[1]), scores.shape)
+            # Merge this tile with the best so far and keep the k highest per row
+            block_scores = np.concatenate([block_scores, scores], axis=1)
+            block_indexes = np.concatenate([block_indexes, indexes], axis=1)
+            if block_scores.shape[1] > k:
+                block_scores, block_indexes = _keep_top_k(block_scores, block_indexes, k)
+        best_scores[row_start:row_stop] = block_scores
+        best_indexes[row_start:row_stop] = block_indexes
+
+    # Sort each row by score (highest first), ties by right index
+    order = np.lexsort((best_indexes, -best_scores), axis=1)
+    return np.take_along_axis(best_indexes, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+def top_k_matches(left, right, k=10, table=None, weights=None, tile_size=DEFAULT_TILE_SIZE,
+                  workers=1, rows_per_task=None):
+    """
+    For every left person, the k best right matches without materializing the full
+    matrix. Returns (indexes, scores): (len(left), min(k, len(right))) arrays sorted by
+    descending score. With workers > 1, row blocks are scored in a process pool.
+    """
+    if k <= 0:
+        raise ValueError("k must be positive")
+    table = _check_table(default_compatibility_table() if table is None else table)
+    k = min(k, len(right))
+    if len(left) == 0 or k == 0:
+        return np.zeros((len(left), k), dtype=np.int64), np.zeros((len(left), k), dtype=np.float32)
+
+    if workers <= 1:
+        return _top_k_block(left.codes, right.codes, k, table, weights, tile_size)
+
+    rows_per_task = rows_per_task or max(tile_size, -(-len(left) // (workers * 4)))
+    blocks = [left.codes[start:start + rows_per_task] for start in range(0, len(left), rows_per_task)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_top_k_block, block, right.codes, k, table, weights, tile_size) for block in blocks]
+        results = [future.result() for future in futures]
+    return (np.concatenate([indexes for indexes, _ in results]),
+            np.concatenate([scores for _, scores in results]))
@@ -0,0 +1,125 @@
+"""
+Personal Year, Month and Day forecasts for many people over date ranges.
+
+Like the Life Path, every forecast number is a digit sum reduced once with the
+reduction rules:
+    Personal Year  = digits(birth month, birth day) + digits(year)
+    Personal Month = Personal Year total + digits(month)
+    Personal Day   = digits(birth month, birth day) + digits(calendar date)
+The calendar part is the Life Path digit sum of each date, so it is computed
+once per date range and shared by everyone; the birth part once per person. A
+forecast is then one broadcast add and one table gather per number type.
+
+Example (nightly job):
+    for chunk in iter_forecasts(client_birth_dates, today, today + datetime.timedelta(days=30)):
+        send(chunk.first_person, chunk.dates, chunk.numbers["Personal Day"])
+"""
+import datetime
+
+import numpy as np
+
+import numerology_calculator_patched as nc
+
+FORECAST_TYPES = ["Personal Year", "Personal Month", "Personal Day"]
+DEFAULT_PEOPLE_PER_CHUNK = 4096
+DEFAULT_DAYS_PER_CHUNK = 366
+
+# Highest total: birth month + day digits <= 20, calendar date digits <= 56
+MAX_TOTAL = 127
+_REDUCED = nc.reduce_number_batch(np.arange(MAX_TOTAL + 1, dtype=np.int64))
+_FINAL_STRINGS = np.append(_REDUCED['final'], 'Error') # Index MAX_TOTAL + 1 marks invalid births
+_FINAL_NUMBERS = np.array([int(s.rsplit('/', 1)[-1]) for s in _REDUCED['final']] + [0], dtype=np.uint8)
+_INVALID = MAX_TOTAL + 1
+
+
+def _birth_terms(birth_dates):
+    """Digit sum of birth month and day per person (_INVALID for unparsable dates)."""
+    _, months, days, _, valid = nc.life_path_digits_batch(birth_dates)
+    terms = nc.sum_digits_array(months) + nc.sum_digits_array(days)
+    return np.where(valid, terms, _INVALID).astype(np.int16)
+
+
+def _date_terms(dates):
+    """Per-date digit sums shared by everyone: (year, year + month, whole date)."""
+    years, months, _, totals, _ = nc.life_path_digits_batch(dates)
+    year_digits = nc.sum_digits_array(years)
+    return (year_digits.astype(np.int16), (year_digits + nc.sum_digits_array(months)).astype(np.int16),
+            totals.astype(np.int16))
+
+
+def _date_range(start, end):
+    if end < start:
+        raise ValueError("end must not be before start")
+    return np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+
+
+class ForecastChunk:
+    """
+    Forecasts for people [first_person, first_person + rows) over `dates`.
+    numbers: {type: (rows, len(dates)) uint8 final numbers ('23/5' -> 5, 0 for invalid births)}
+    sums: {type: (rows, len(dates)) int16 totals (MAX_TOTAL + 1 for invalid births)}
+    """
+    __slots__ = ('first_person', 'dates', 'sums', 'numbers')
+
+    def __init__(self, first_person, dates, sums):
+        self.first_person = first_person
+        self.dates = dates
+        self.sums = sums
+        self.numbers = {number_type: _FINAL_NUMBERS[total] for number_type, total in sums.items()}
+
+    @property
+    def rows(self):
+        return len(next(iter(self.sums.values())))
+
+    def strings(self, number_type):
+        """Final number strings ('23/5', '11', 'Error') as an object array."""
+        return _FINAL_STRINGS[self.sums[number_type]]
+
+
+def _chunk_sums(birth, date_terms):
+    """Totals for a block of people (birth terms) against a block of dates."""
+    year, year_month, day = date_terms
+    invalid = (birth == _INVALID)[:, None]
+    birth = birth[:, None]
+    return {number_type: np.where(invalid, _INVALID, birth + term[None, :]).astype(np.int16)
+            for number_type, term in zip(FORECAST_TYPES, (year, year_month, day))}
+
+
+def iter_forecasts(birth_dates, start, end, people_per_chunk=DEFAULT_PEOPLE_PER_CHUNK,
+                   days_per_chunk=DEFAULT_DAYS_PER_CHUNK):
+    """
+    Yields ForecastChunks covering every person (in input order) and every date
+    from start to end inclusive, people-major: all date blocks of the first people
+    block, then the next. Memory stays at one chunk of
+    people_per_chunk x days_per_chunk cells per number type.
+    """
+    birth = _birth_terms(birth_dates)
+    dates = _date_range(start, end)
+    date_terms = _date_terms(dates)
+    for person_start in range(0, len(birth), people_per_chunk):
+        people = birth[person_start:person_start + people_per_chunk]
+        for day_start in range(0, len(dates), days_per_chunk):
+            day_stop = day_start + days_per_chunk
+            terms = tuple(term[day_start:day_stop] for term in date_terms)
+            yield ForecastChunk(person_start, dates[day_start:day_stop], _chunk_sums(people, terms))
+
+
+def forecast(birth_dates, start, end):
+    """Whole forecast as one ForecastChunk (len(birth_dates) x days); use iter_forecasts for large runs."""
+    birth = _birth_terms(birth_dates)
+    dates = _date_range(start, end)
+    return ForecastChunk(0, dates, _chunk_sums(birth, _date_terms(dates)))
+
+
+def personal_numbers(birth_date_str, target_date=None):
+    """
+    Personal Year, Month and Day of one person for one date (default today), in the
+    calculators' {'number', 'sum'} form; an invalid birth date gives 'Error' and 0.
+    """
+    target_date = target_date or datetime.date.today()
+    chunk = forecast([birth_date_str], target_date, target_date)
+    results = {}
+    for number_type in FORECAST_TYPES:
+        total = int(chunk.sums[number_type][0, 0])
+        results[number_type] = {'number': str(_FINAL_STRINGS[total]), 'sum': total if total != _INVALID else 0}
+    return results
@@ -0,0 +1,187 @@
+"""
+Opt-in per-stage timing, counters and a sampling profiler for the calculation pipeline.
+
+Disabled by default. Instrumented code checks `instrumentation.enabled` before
+reading the clock, so the cost when disabled is one attribute lookup per stage.
+Enable with enable() or by setting NUMEROLOGY_INSTRUMENTATION=1 before import.
+
+Stages recorded by the calculator: name_cleaning, letter_scoring, y_vowel_detection,
+reduction, log_rendering, life_path; by the interpretation store:
+interpretation_lookup; by app.py: streamlit_rendering.
+
+Export with snapshot() (JSON-friendly dict) or prometheus_text().
+"""
+import collections
+import os
+import sys
+import threading
+import time
+
+enabled = os.environ.get('NUMEROLOGY_INSTRUMENTATION', '') not in ('', '0', 'false', 'False')
+
+_lock = threading.Lock()
+_stages = {} # stage -> [count, total seconds, min seconds, max seconds]
+_counters = collections.Counter()
+
+
+def enable():
+    """Starts recording stage timings and counters."""
+    global enabled
+    enabled = True
+
+
+def disable():
+    """Stops recording (already recorded data is kept until reset())."""
+    global enabled
+    enabled = False
+
+
+def reset():
+    """Drops all recorded timings and counters."""
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+
+def record(stage, seconds):
+    """Adds one timing for a stage."""
+    with _lock:
+        entry = _stages.get(stage)
+        if entry is None:
+            _stages[stage] = [1, seconds, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds < entry[2]:
+                entry[2] = seconds
+            if seconds > entry[3]:
+                entry[3] = seconds
+
+
+def count(counter, amount=1):
+    """Increments a counter (calls, cache hits, error results, ...)."""
+    with _lock:
+        _counters[counter] += amount
+
+
+class stage:
+    """
+    Context manager timing a block as one stage when instrumentation is enabled:
+        with instrumentation.stage('streamlit_rendering'):
+            ...
+    """
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name):
+        self.name = name
+        self.started = None
+
+    def __enter__(self):
+        if enabled:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self.started is not None:
+            record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+# --- Export ---
+
+def snapshot():
+    """Returns recorded stages and counters as a JSON-serializable dictionary."""
+    with _lock:
+        stages = {
+            name: {'count': n, 'total_seconds': total, 'mean_seconds': total / n,
+                   'min_seconds': low, 'max_seconds': high}
+            for name, (n, total, low, high) in sorted(_stages.items())
+        }
+        counters = dict(sorted(_counters.items()))
+    return {'enabled': enabled, 'stages': stages, 'counters': counters,
+            'sampling_profiler': _profiler is not None}
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text():
+    """Returns recorded stages and counters in the Prometheus text exposition format."""
+    data = snapshot()
+    lines = ["# HELP numerology_stage_seconds Time spent per calculation stage.",
+             "# TYPE numerology_stage_seconds summary"]
+    for name, entry in data['stages'].items():
+        label = f'stage="{_escape_label(name)}"'
+        lines.append(f"numerology_stage_seconds_count{{{label}}} {entry['count']}")
+        lines.append(f"numerology_stage_seconds_sum{{{label}}} {entry['total_seconds']:.9f}")
+    lines += ["# HELP numerology_events_total Calculation counters (calls, cache hits, error results).",
+              "# TYPE numerology_events_total counter"]
+    for name, value in data['counters'].items():
+        lines.append(f'numerology_events_total{{event="{_escape_label(name)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+# --- Sampling profiler ---
+
+class SamplingProfiler:
+    """
+    Background thread that samples the stacks of all other threads every `interval`
+    seconds and counts them in collapsed ("folded") form for flame graphs.
+    """
+
+    def __init__(self, interval=0.005, max_depth=64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='numerology-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def folded(self):
+        """Collapsed stacks, one 'frame;frame;frame count' line per distinct stack."""
+        return "\n".join(f"{stack} {n}" for stack, n in self.samples.most_common())
+
+
+_profiler = None
+
+
+def start_sampling_profiler(interval=0.005):
+    """Starts the sampling profiler (no-op if it is already running)."""
+    global _profiler
+    if _profiler is None:
+        _profiler = SamplingProfiler(interval)
+        _profiler.start()
+    return _profiler
+
+
+def stop_sampling_profiler():
+    """Stops the sampling profiler and returns it (None if it was not running)."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def sampling_profiler_running():
+    return _profiler is not None
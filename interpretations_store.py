@@ -0,0 +1,332 @@
+"""
+Compiled, indexed interpretation store.
+
+interpretations.csv is compiled once into a compact binary file (next to the CSV,
+'interpretations.idx' by default) holding the text for every "Numerology<n>" key,
+indexed by the integer n, with the placeholder check already resolved and the
+markdown blocks for every number string the calculator can produce already
+rendered. Cold starts memory-map the compiled file instead of parsing the CSV,
+and get_store() recompiles automatically when the CSV's mtime or size changes.
+"""
+import csv
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+
+import numerology_calculator_patched as nc
+import instrumentation
+
+MAGIC = b'NUMIDX01'
+FORMAT_VERSION = 1
+_HEADER_LENGTH = struct.Struct('<I')
+_KEY_PATTERN = re.compile(r'Numerology([1-9][0-9]*)$')
+
+
+class InterpretationFormatError(ValueError):
+    """The interpretations CSV does not have the expected 'key' and 'text' columns."""
+
+
+# --- Number string parsing ---
+
+def get_numerology_parts(num_str):
+    """
+    Parses a numerology number string (e.g., "5", "11", "23/5")
+    into an initial part and a final part.
+    Returns (initial_part, final_part).
+    If num_str is a single number like "5", returns (None, "5").
+    If num_str is invalid or not a string, returns (None, None).
+    """
+    if not isinstance(num_str, str) or not num_str:
+        return None, None
+
+    if '/' in num_str:
+        parts = num_str.split('/', 1)
+        if len(parts) == 2 and parts[0].strip().isdigit() and parts[1].strip().isdigit():
+            return parts[0].strip(), parts[1].strip()
+        else: # Malformed (e.g., "23/abc", "23/", "/5")
+            return None, num_str # Fallback for display, but key lookup will likely fail
+    elif num_str.strip().isdigit():
+        return None, num_str.strip()
+    else: # Non-numeric string like "Error", "Invalid Input"
+        return None, None # Indicates no valid parts for lookup
+
+
+def is_placeholder(text):
+    """True if an interpretation text is missing or still a placeholder ("Interpr...")."""
+    return not text or text.lower().startswith('interpr')
+
+
+def _number_key(part):
+    """Integer index for a number part, or None if it is not a canonical number."""
+    if part and part.isdigit() and str(int(part)) == part:
+        return int(part)
+    return None
+
+
+def render_blocks(num_str, get_text):
+    """
+    Builds the markdown blocks shown for a number string such as "23/5".
+    get_text(part) returns the interpretation text for a number part or None.
+    """
+    initial_part, final_part = get_numerology_parts(num_str)
+    collected_interpretation_texts = []
+
+    # 1. Text for the final_part (e.g., for '5' in '23/5', or '11' in '11')
+    if final_part:
+        text_from_db = get_text(final_part)
+        if not is_placeholder(text_from_db):
+            display_text = text_from_db
+        else:
+            display_text = f"[Text for aspect '{final_part}' not found or is a placeholder in interpretations.csv]"
+        collected_interpretation_texts.append(display_text)
+
+    # 2. Text for the initial_part (e.g., for '23' in '23/5'), if it exists
+    if initial_part:
+        initial_text_from_db = get_text(initial_part) or ""
+        if initial_text_from_db: # Added even if it's a placeholder like "Interpr..."
+            section = f"**Regarding the initial sum component ({initial_part}):**\n{initial_text_from_db}"
+            # Add a separator if both final_part and initial_part texts are present
+            if collected_interpretation_texts and collected_interpretation_texts[0] != "" and not collected_interpretation_texts[0].startswith("[Text for aspect"):
+                collected_interpretation_texts.append("\n\n---\n\n" + section)
+            else:
+                collected_interpretation_texts.append(section)
+
+    return collected_interpretation_texts
+
+
+# --- Compilation ---
+
+def read_interpretations_csv(csv_file_path):
+    """Parses the CSV into {number: text} for every "Numerology<n>" key."""
+    texts = {}
+    with open(csv_file_path, mode='r', encoding='utf-8') as infile:
+        reader = csv.DictReader(infile)
+        if not reader.fieldnames or 'key' not in reader.fieldnames or 'text' not in reader.fieldnames:
+            raise InterpretationFormatError(f"CSV file '{csv_file_path}' must contain 'key' and 'text' columns.")
+        for row in reader:
+            match = _KEY_PATTERN.match(row['key'] or '')
+            if match:
+                texts[int(match.group(1))] = row['text']
+    return texts
+
+
+def producible_number_strings():
+    """Every final string reduce_number produces for sums in the reduction table range."""
+    table = nc._reduction_table
+    if table is None:
+        table = nc.build_reduction_table()
+    return sorted(set(table.final.tolist()), key=lambda s: (len(s), s))
+
+
+def compile_interpretations(texts, source_mtime_ns=0, source_size=0):
+    """Compiles {number: text} into the binary store format and returns the bytes."""
+    blobs = bytearray()
+
+    def add_blob(text):
+        data = text.encode('utf-8')
+        offset = len(blobs)
+        blobs.extend(data)
+        return [offset, len(data)]
+
+    numbers = {}
+    for number, text in sorted(texts.items()):
+        numbers[str(number)] = add_blob(text) + [is_placeholder(text)]
+
+    def get_text(part):
+        number = _number_key(part)
+        return texts.get(number) if number is not None else None
+
+    rendered = {}
+    for num_str in producible_number_strings():
+        rendered[num_str] = [add_blob(block) for block in render_blocks(num_str, get_text)]
+
+    header = json.dumps({
+        'version': FORMAT_VERSION,
+        'source_mtime_ns': source_mtime_ns,
+        'source_size': source_size,
+        'numbers': numbers,
+        'rendered': rendered,
+    }, separators=(',', ':')).encode('utf-8')
+    return MAGIC + _HEADER_LENGTH.pack(len(header)) + header + bytes(blobs)
+
+
+def default_compiled_path(csv_file_path):
+    """Compiled store path used for a CSV: same directory, '.idx' extension."""
+    return os.path.splitext(csv_file_path)[0] + '.idx'
+
+
+# --- Store ---
+
+class InterpretationStore:
+    """
+    Read-only view over a compiled interpretation file (bytes or a memory map).
+    Texts and rendered blocks are decoded on first access and then kept.
+    """
+
+    def __init__(self, buffer, source_path=None):
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a compiled interpretation store")
+        (header_length,) = _HEADER_LENGTH.unpack_from(buffer, len(MAGIC))
+        header_start = len(MAGIC) + _HEADER_LENGTH.size
+        header = json.loads(bytes(buffer[header_start:header_start + header_length]).decode('utf-8'))
+        if header['version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported interpretation store version: {header['version']}")
+
+        self._buffer = buffer
+        self._data_start = header_start + header_length
+        self.source_path = source_path
+        self.source_mtime_ns = header['source_mtime_ns']
+        self.source_size = header['source_size']
+        self._numbers = {int(number): entry for number, entry in header['numbers'].items()}
+        self._rendered_index = header['rendered']
+        self._texts = {}
+        self._rendered = {}
+
+    def _decode(self, offset, length):
+        start = self._data_start + offset
+        return bytes(self._buffer[start:start + length]).decode('utf-8')
+
+    def __len__(self):
+        return len(self._numbers)
+
+    def __contains__(self, number):
+        """True if the integer number (or canonical digit string) has an entry."""
+        if isinstance(number, str):
+            number = _number_key(number)
+        return number in self._numbers
+
+    def numbers(self):
+        """Sorted list of numbers that have an interpretation."""
+        return sorted(self._numbers)
+
+    def get_text(self, number, default=None):
+        """Raw interpretation text for an integer number (or canonical digit string)."""
+        if isinstance(number, str):
+            number = _number_key(number)
+        text = self._texts.get(number)
+        if text is None:
+            entry = self._numbers.get(number)
+            if entry is None:
+                return default
+            text = self._texts[number] = self._decode(entry[0], entry[1])
+        return text
+
+    def is_placeholder(self, number):
+        """Pre-resolved placeholder status; True for numbers without text."""
+        if isinstance(number, str):
+            number = _number_key(number)
+        entry = self._numbers.get(number)
+        return entry is None or entry[2]
+
+    def render(self, num_str):
+        """Markdown blocks for a calculated number string such as "23/5" or "11"."""
+        if instrumentation.enabled:
+            started = time.perf_counter()
+            blocks = self._render(num_str)
+            instrumentation.record('interpretation_lookup', time.perf_counter() - started)
+            return blocks
+        return self._render(num_str)
+
+    def _render(self, num_str):
+        blocks = self._rendered.get(num_str)
+        if blocks is None:
+            index = self._rendered_index.get(num_str)
+            if index is None: # Not a producible string; rendered on demand and not kept
+                return render_blocks(num_str, self.get_text)
+            blocks = self._rendered[num_str] = [self._decode(offset, length) for offset, length in index]
+        return blocks
+
+    def is_stale(self):
+        """True if the source CSV changed since this store was compiled."""
+        if not self.source_path:
+            return False
+        try:
+            stat = os.stat(self.source_path)
+        except OSError:
+            return True
+        return stat.st_mtime_ns != self.source_mtime_ns or stat.st_size != self.source_size
+
+    def close(self):
+        """Releases the memory map, if any."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+def _open_compiled(compiled_path, csv_file_path):
+    """Memory-maps a compiled store; returns None if it is missing, invalid or stale."""
+    try:
+        with open(compiled_path, 'rb') as infile:
+            buffer = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        store = InterpretationStore(buffer, csv_file_path)
+    except (ValueError, KeyError, struct.error):
+        buffer.close()
+        return None
+    if store.is_stale():
+        store.close()
+        return None
+    return store
+
+
+def build_store(csv_file_path, compiled_path=None):
+    """
+    Parses the CSV, compiles it, and writes the compiled file (best effort; a
+    read-only directory just means the next cold start parses the CSV again).
+    """
+    stat = os.stat(csv_file_path)
+    texts = read_interpretations_csv(csv_file_path)
+    data = compile_interpretations(texts, stat.st_mtime_ns, stat.st_size)
+    compiled_path = compiled_path or default_compiled_path(csv_file_path)
+    directory, filename = os.path.split(os.path.abspath(compiled_path))
+    try:
+        # A temp file of its own, so concurrent builders never write into the same file
+        fd, temp_path = tempfile.mkstemp(prefix=filename + '.', suffix='.tmp', dir=directory)
+    except OSError:
+        return InterpretationStore(data, csv_file_path)
+    try:
+        with os.fdopen(fd, 'wb') as outfile:
+            outfile.write(data)
+        os.chmod(temp_path, 0o644) # mkstemp creates the file readable by its owner only
+        os.replace(temp_path, compiled_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+    return InterpretationStore(data, csv_file_path)
+
+
+def load_store(csv_file_path, compiled_path=None):
+    """Opens the compiled store if it is up to date, otherwise rebuilds it from the CSV."""
+    compiled_path = compiled_path or default_compiled_path(csv_file_path)
+    store = _open_compiled(compiled_path, csv_file_path)
+    if store is None:
+        store = build_store(csv_file_path, compiled_path)
+    return store
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(csv_file_path='interpretations.csv', compiled_path=None):
+    """
+    Returns the store for a CSV, loading it once per process and reloading it when
+    the CSV's mtime or size changes. Raises FileNotFoundError if the CSV is missing
+    and InterpretationFormatError if its columns are wrong.
+    """
+    key = os.path.abspath(csv_file_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None or store.is_stale():
+            # The replaced store is not closed: other sessions may still hold it, and
+            # its memory map is released when the last reference goes away
+            store = _stores[key] = load_store(csv_file_path, compiled_path)
+        return store
@@ -0,0 +1,170 @@
+"""
+Unicode-aware name cleaning for the name calculators.
+
+Every character is folded to the letters A-Z it stands for: the character and its
+upper-case form are looked up in the special-letter map and the enabled script
+tables, otherwise decomposed with NFKD and stripped of anything outside A-Z.
+So 'José' scores like 'Jose', 'Straße' like 'STRASSE' and 'Ærø' like 'AERO'.
+For ASCII input the result is exactly re.sub(r'[^A-Z]', '', name.upper()).
+
+The folds are compiled into one str.translate table when the module is imported
+(characters outside the precompiled ranges are folded the first time they are
+seen) and normalize_name() caches results per input name. normalize() and
+dropped_characters() also report dropped characters: letters, digits and symbols that had no A-Z equivalent (spaces,
+punctuation and combining marks are expected and not reported).
+"""
+import functools
+import unicodedata
+from collections import namedtuple
+
+CACHE_SIZE = 65536
+
+# Letters NFKD does not decompose into A-Z (keys are upper case)
+SPECIAL_LETTERS = {
+    'ß': 'SS', 'ẞ': 'SS', 'Æ': 'AE', 'Œ': 'OE', 'Ø': 'O', 'Ł': 'L', 'Đ': 'D', 'Ð': 'D',
+    'Þ': 'TH', 'Ħ': 'H', 'Ŧ': 'T', 'Ŋ': 'NG', 'Ə': 'E', 'Ɛ': 'E', 'Ɔ': 'O', 'ĸ': 'K',
+}
+
+# Optional per-script tables, enabled with configure(scripts=[...])
+SCRIPT_TABLES = {
+    'german': {'Ä': 'AE', 'Ö': 'OE', 'Ü': 'UE'}, # Umlauts spelled out instead of folded to A/O/U
+    'greek': {
+        'Α': 'A', 'Β': 'B', 'Γ': 'G', 'Δ': 'D', 'Ε': 'E', 'Ζ': 'Z', 'Η': 'I', 'Θ': 'TH',
+        'Ι': 'I', 'Κ': 'K', 'Λ': 'L', 'Μ': 'M', 'Ν': 'N', 'Ξ': 'X', 'Ο': 'O', 'Π': 'P',
+        'Ρ': 'R', 'Σ': 'S', 'Τ': 'T', 'Υ': 'Y', 'Φ': 'F', 'Χ': 'CH', 'Ψ': 'PS', 'Ω': 'O',
+    },
+    'cyrillic': {
+        'А': 'A', 'Б': 'B', 'В': 'V', 'Г': 'G', 'Д': 'D', 'Е': 'E', 'Ё': 'E', 'Ж': 'ZH',
+        'З': 'Z', 'И': 'I', 'Й': 'Y', 'К': 'K', 'Л': 'L', 'М': 'M', 'Н': 'N', 'О': 'O',
+        'П': 'P', 'Р': 'R', 'С': 'S', 'Т': 'T', 'У': 'U', 'Ф': 'F', 'Х': 'KH', 'Ц': 'TS',
+        'Ч': 'CH', 'Ш': 'SH', 'Щ': 'SHCH', 'Ъ': '', 'Ы': 'Y', 'Ь': '', 'Э': 'E', 'Ю': 'YU',
+        'Я': 'YA', 'І': 'I', 'Ї': 'YI', 'Є': 'YE', 'Ґ': 'G',
+    },
+}
+
+# Code point ranges folded up front: Latin-1, Latin Extended-A/B, IPA, Greek,
+# Cyrillic, Latin Extended Additional, ligatures and fullwidth forms
+_PRECOMPILED_RANGES = ((0x0000, 0x0250), (0x0370, 0x0530), (0x1E00, 0x1F00),
+                       (0xFB00, 0xFB07), (0xFF00, 0xFF5F))
+_REPORTED_CATEGORIES = ('L', 'N', 'S') # Dropped letters, digits and symbols are reported
+
+NormalizedName = namedtuple('NormalizedName', ['clean_name', 'dropped'])
+
+
+def fold_character(char, letters):
+    """The A-Z letters a single character stands for ('' if none), using the letters map."""
+    if char in letters:
+        return letters[char]
+    folded = []
+    for upper in char.upper():
+        if upper in letters:
+            folded.append(letters[upper])
+            continue
+        for part in unicodedata.normalize('NFKD', upper):
+            if part in letters:
+                folded.append(letters[part])
+            elif 'A' <= part <= 'Z':
+                folded.append(part)
+            elif part.upper() != part: # e.g. dotless i decomposes to itself but upper-cases to I
+                folded.extend(c for c in part.upper() if 'A' <= c <= 'Z')
+    return ''.join(folded)
+
+
+class _TranslationTable(dict):
+    """str.translate table that folds code points missing from it on first use."""
+
+    def __init__(self, fold):
+        super().__init__()
+        self.fold = fold
+
+    def __missing__(self, code):
+        value = self.fold(chr(code))
+        self[code] = value
+        return value
+
+
+def _compile(letters):
+    """Builds the folding table (char -> A-Z string or None) and the dropped-character table."""
+    def fold(char):
+        return fold_character(char, letters) or None
+
+    def dropped(char):
+        # Keeps a character only if it is dropped and worth reporting
+        if char in letters or char.upper() in letters: # Mapped to '' on purpose
+            return None
+        if fold(char) is None and unicodedata.category(char)[0] in _REPORTED_CATEGORIES:
+            return char
+        return None
+
+    table = _TranslationTable(fold)
+    dropped_table = _TranslationTable(dropped)
+    codes = [code for start, stop in _PRECOMPILED_RANGES for code in range(start, stop)]
+    codes += [ord(char) for key in letters for char in (key, key.lower())]
+    for code in codes:
+        table[code]
+        dropped_table[code]
+    return table, dropped_table
+
+
+def _clean(name):
+    """The cleaned A-Z form of a name; normalize_name is this function, cached per input."""
+    return name.translate(_table)
+
+
+def configure(scripts=(), cache_size=CACHE_SIZE, extra_letters=None):
+    """
+    Recompiles the translation table with the given SCRIPT_TABLES names enabled and
+    optional extra {upper-case char: letters} entries, and resets the cache
+    (cache_size 0 or None disables it).
+    """
+    global _table, _dropped_table
+    letters = dict(SPECIAL_LETTERS)
+    for script in scripts:
+        if script not in SCRIPT_TABLES:
+            raise ValueError(f"Unknown script table '{script}'; use one of {sorted(SCRIPT_TABLES)}")
+        letters.update(SCRIPT_TABLES[script])
+    letters.update(extra_letters or {})
+    _table, _dropped_table = _compile(letters)
+    configure_cache(cache_size)
+
+
+def configure_cache(cache_size=CACHE_SIZE):
+    """Replaces the per-name cache with an empty one of the given size (0 or None disables it)."""
+    global normalize_name
+    normalize_name = functools.lru_cache(maxsize=cache_size)(_clean) if cache_size else _clean
+
+
+def register_script_table(script, letters):
+    """Adds or replaces a per-script table ({upper-case char: A-Z letters}); enable it with configure()."""
+    SCRIPT_TABLES[script] = dict(letters)
+
+
+def normalize_names(names):
+    """Cleaned forms of many names, uncached (batches are mostly unique names)."""
+    table = _table
+    return [name.translate(table) for name in names]
+
+
+def dropped_characters(name):
+    """Letters, digits and symbols of the name that have no A-Z equivalent (in order)."""
+    return name.translate(_dropped_table)
+
+
+def normalize(name):
+    """Cleans a name and reports what was dropped: NormalizedName(clean_name, dropped)."""
+    return NormalizedName(normalize_name(name), dropped_characters(name))
+
+
+def cache_stats():
+    """Hit/miss statistics of the per-name cache (None when disabled)."""
+    if not hasattr(normalize_name, 'cache_info'):
+        return None
+    info = normalize_name.cache_info()
+    lookups = info.hits + info.misses
+    return {'size': info.currsize, 'maxsize': info.maxsize, 'hits': info.hits,
+            'misses': info.misses, 'hit_rate': info.hits / lookups if lookups else 0.0}
+
+
+_table = _dropped_table = None
+normalize_name = _clean # Replaced by the cached version in configure_cache()
+configure()
@@ -1,18 +1,39 @@
 # D:\numerology_streamlit_app\numerology_calculator.py
 import math
 import datetime
-import re # Used for cleaning the name string
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping # Calculation results behave like read-only dicts
+from dataclasses import dataclass
+import numpy as np # Used by the batch (vectorized) calculators
+import instrumentation # Opt-in per-stage timings and counters
+import name_normalization # Unicode-aware name cleaning (str.translate table)
+import numerology_systems # Letter-value systems compiled into byte lookup tables
 
 # --- Configuration ---
-# Based on the provided table
-letter_values = {
-    'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5, 'F': 6, 'G': 7, 'H': 8, 'I': 9,
-    'J': 1, 'K': 2, 'L': 3, 'M': 4, 'N': 5, 'O': 6, 'P': 7, 'Q': 8, 'R': 9,
-    'S': 1, 'T': 2, 'U': 3, 'V': 4, 'W': 5, 'X': 6, 'Y': 7, 'Z': 8
-}
+# Based on the provided table (the Pythagorean system; other systems live in numerology_systems)
+letter_values = numerology_systems.PYTHAGOREAN_VALUES
 
 # Vowels (Standard definition, Y is not treated as a vowel based on user feedback)
 VOWELS = 'AEIOU'
+_default_system = numerology_systems.PYTHAGOREAN # Used when no system is given
+
+# The core number types in display order, each with the key it uses in batch
+# results, NameAnalysis fields ('expression' -> expression_sum), columns and files.
+# Every other module takes its list of number types from here.
+NUMBER_TYPES = {
+    "Life Path": 'life_path',
+    "Expression": 'expression',
+    "Soul Urge": 'soul_urge',
+    "Personality": 'personality',
+}
+NAME_NUMBER_TYPES = {number_type: key for number_type, key in NUMBER_TYPES.items() if number_type != "Life Path"}
+
+# Numbers 0..REDUCTION_TABLE_SIZE-1 are reduced through a precomputed lookup table
+# (see build_reduction_table). Name sums top out in the low thousands, dates under 60.
+REDUCTION_TABLE_SIZE = 10000
+_reduction_table = None # Built at the end of this module
 
 
 def is_y_vowel(name, index):
@@ -63,7 +84,18 @@ def reduce_number(num):
     provided in the Apps Script logic.
 
     Returns a dictionary containing calculation steps and the final string.
+    Numbers covered by the precomputed reduction table are an O(1) lookup;
+    anything else falls back to the rule logic in _reduce_number_rules.
     """
+    table = _reduction_table
+    if table is not None and type(num) is int and 0 <= num < table.size:
+        r1, r2, r3, rule, final_str = table.entries[num]
+        return {'initial': num, 'r1': r1, 'r2': r2, 'r3': r3, 'final': final_str,
+                'log': _render_reduction_log(num, r1, r2, r3, rule, final_str)}
+    return _reduce_number_rules(num)
+
+def _reduce_number_rules(num):
+    """Applies the reduction rules step by step (used outside the lookup table)."""
     # THIS IS YOUR ORIGINAL reduce_number FUNCTION LOGIC
     if not isinstance(num, int) or num < 0:
         # Adding a check for non-integer inputs which might happen if sum is zero initially
@@ -138,120 +170,506 @@ def reduce_number(num):
     return {'initial': initial_num, 'r1': r1, 'r2': r2, 'r3': r3, 'final': final_str, 'log': "\n".join(log)}
 
 
+# --- Calculation Results and Lazy Logs ---
+# Calculators record their steps as small tuples (format key, *args) and only turn
+# them into log text when the log is actually read. A whole name is one
+# ('letters', kind, NameAnalysis) step; the per-letter lines are rebuilt at render
+# time. With with_log=False no steps are recorded at all.
+
+_LOG_FORMATS = {
+    'header': "Calculating %s for: %s -> %s",
+    'life_path_header': "Calculating Life Path for: %s",
+    'total': "  Total Sum = %s",
+    'date_parsed': "  Date parsed: Year=%s, Month=%s, Day=%s",
+    'date_digits': "  Digits sum (%s+%s+%s): %s",
+    'date_format_error': "  Error: Invalid date format. Please use YYYY-MM-DD.",
+    'unexpected_error': "  An unexpected error occurred: %s",
+    'text': "%s",
+}
+
+
+def _render_letters(kind, analysis):
+    """
+    Renders the per-letter log lines of one name calculator from a NameAnalysis,
+    with the letter values of the system the name was scored with.
+    """
+    values = analysis.system.value_table
+    if kind == 'Expression':
+        return "\n".join([f"  '{letter}' = {values[ord(letter)]}" for letter in analysis.clean_name])
+    lines = []
+    for letter, is_vowel in zip(analysis.clean_name, analysis.vowel_flags):
+        if kind == 'Soul Urge':
+            lines.append(f"  '{letter}' (Vowel) = {values[ord(letter)]}" if is_vowel
+                         else f"  '{letter}' (Consonant) skipped")
+        else:
+            lines.append(f"  '{letter}' (Vowel) skipped" if is_vowel
+                         else f"  '{letter}' (Consonant) = {values[ord(letter)]}")
+    return "\n".join(lines)
+
+
+def render_log(steps):
+    """Renders recorded calculation steps into the log text."""
+    if instrumentation.enabled:
+        started = time.perf_counter()
+        log = _render_steps(steps)
+        instrumentation.record('log_rendering', time.perf_counter() - started)
+        return log
+    return _render_steps(steps)
+
+
+def _render_steps(steps):
+    lines = []
+    for step in steps:
+        key = step[0]
+        if key == 'reduce':
+            lines.append(_render_reduction_log(*step[1:]))
+        elif key == 'letters':
+            if step[2].clean_name: # An empty name has no letter lines
+                lines.append(_render_letters(step[1], step[2]))
+        else:
+            lines.append(_LOG_FORMATS[key] % step[1:])
+    return "\n".join(lines)
+
+
+class NumerologyResult(Mapping):
+    """
+    Compact result of one calculator: the final number string, the initial sum and
+    the recorded steps. The log is rendered the first time it is read (and cached).
+    Behaves like the {'number', 'sum', 'log'} dictionary the calculators return;
+    'log' is only present when the result was calculated with with_log=True.
+    """
+    __slots__ = ('number', 'sum', '_steps', '_log')
+
+    def __init__(self, number, total, steps=None):
+        self.number = number
+        self.sum = total
+        self._steps = steps
+        self._log = None
+
+    @property
+    def log(self):
+        """The calculation log text, or None if no steps were recorded."""
+        if self._log is None and self._steps is not None:
+            self._log = render_log(self._steps)
+        return self._log
+
+    def __getitem__(self, key):
+        if key == 'number':
+            return self.number
+        if key == 'sum':
+            return self.sum
+        if key == 'log' and self._steps is not None:
+            return self.log
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(('number', 'sum', 'log') if self._steps is not None else ('number', 'sum'))
+
+    def __len__(self):
+        return 3 if self._steps is not None else 2
+
+    def __repr__(self):
+        return f"NumerologyResult(number={self.number!r}, sum={self.sum!r})"
+
+    def to_dict(self):
+        """Returns the plain dictionary form (renders the log if it was recorded)."""
+        if self._steps is None:
+            return {'number': self.number, 'sum': self.sum}
+        return {'number': self.number, 'sum': self.sum, 'log': self.log}
+
+
+def _reduction_step(total):
+    """Reduces total and returns (final string, log step) without rendering the log."""
+    if instrumentation.enabled:
+        started = time.perf_counter()
+        result = _reduction_step_untimed(total)
+        instrumentation.record('reduction', time.perf_counter() - started)
+        return result
+    return _reduction_step_untimed(total)
+
+
+def _reduction_step_untimed(total):
+    table = _reduction_table
+    if table is not None and 0 <= total < table.size:
+        entry = table.entries[total]
+        return entry[4], ('reduce', total) + entry
+    reduction_result = _reduce_number_rules(total)
+    return reduction_result['final'], ('text', reduction_result['log'])
+
+
+def _finish(total, steps, as_record, system=None):
+    """
+    Reduces the total (with the system's reduction variant, if given), closes the
+    step list and builds the requested result form.
+    """
+    if system is not None and system.reduction == 'single_digit':
+        final_str = _single_digit_final(total)
+        reduce_step = ('text', f"Reducing: {total}\n -> Single-digit reduction ({system.name}). Final: {final_str}")
+    else:
+        final_str, reduce_step = _reduction_step(total)
+    if instrumentation.enabled and final_str == 'Invalid Input':
+        instrumentation.count('errors.Invalid Input')
+    if steps is not None:
+        steps.append(('total', total))
+        steps.append(reduce_step)
+    record = NumerologyResult(final_str, total, steps)
+    return record if as_record else record.to_dict()
+
+
+# --- Caching ---
+# Names and birth dates repeat a lot in real traffic, so analyze_name and
+# calculate_life_path keep bounded LRU caches keyed on the cleaned name and the date.
+# Use configure_caches to resize or disable them and cache_stats to inspect them.
+
+NAME_CACHE_SIZE = 65536
+DATE_CACHE_SIZE = 65536
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with hit/miss/eviction counters. A lock
+    guards every access, since Streamlit sessions share the cache from their own threads.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Returns the cached value (marking it recently used) or None."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Stores a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drops all entries and resets the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Returns the cache counters as a dictionary."""
+        lookups = self.hits + self.misses
+        return {'size': len(self._data), 'maxsize': self.maxsize, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+
+_name_cache = LRUCache(NAME_CACHE_SIZE)
+_date_cache = LRUCache(DATE_CACHE_SIZE)
+_life_path_table = {} # Filled by precompute_life_paths; never evicted
+
+
+def configure_caches(name_cache_size=NAME_CACHE_SIZE, date_cache_size=DATE_CACHE_SIZE,
+                     normalization_cache_size=name_normalization.CACHE_SIZE):
+    """
+    Replaces the name, date and name normalization caches with empty ones of the
+    given sizes (0 or None disables).
+    """
+    global _name_cache, _date_cache
+    _name_cache = LRUCache(name_cache_size) if name_cache_size else None
+    _date_cache = LRUCache(date_cache_size) if date_cache_size else None
+    name_normalization.configure_cache(normalization_cache_size)
+
+
+def cache_stats():
+    """Returns hit/miss/eviction statistics for the name, date and normalization caches."""
+    return {
+        'normalization': name_normalization.cache_stats(),
+        'name': _name_cache.stats() if _name_cache is not None else None,
+        'date': _date_cache.stats() if _date_cache is not None else None,
+        'life_path_table': {'size': len(_life_path_table)},
+    }
+
+
+def precompute_life_paths(start=datetime.date(1900, 1, 1), end=None):
+    """
+    Precomputes the Life Path digits for every date from start to end (default: today),
+    the same range the app's date picker allows. Both date objects and YYYY-MM-DD
+    strings hit the table.
+    """
+    end = end or datetime.date.today()
+    day = start
+    one_day = datetime.timedelta(days=1)
+    while day <= end:
+        digits = _life_path_digits(day)
+        _life_path_table[day] = digits
+        _life_path_table[day.isoformat()] = digits
+        day += one_day
+    return len(_life_path_table)
+
+
+# --- Name Analysis ---
+
+# Result of analyze_name: the cleaned name, one vowel flag per letter (Y rule applied),
+# the three name sums and the NumerologySystem they were scored with.
+NameAnalysis = namedtuple('NameAnalysis', ['name', 'clean_name', 'vowel_flags',
+                                           'expression_sum', 'soul_urge_sum', 'personality_sum', 'system'])
+
+
+def analyze_name(name, system=None):
+    """
+    Cleans the name once and classifies every letter as vowel or consonant in a
+    single pass, producing the Expression, Soul Urge and Personality sums together.
+    Letters are scored with the system's byte tables (Pythagorean by default).
+    """
+    instrumented = instrumentation.enabled
+    if instrumented:
+        started = time.perf_counter()
+    clean_name = name_normalization.normalize_name(name) # Keep only letters, folded to A-Z
+    if instrumented:
+        instrumentation.record('name_cleaning', time.perf_counter() - started)
+    system = _default_system if system is None else numerology_systems.get_system(system)
+    return _analyze_clean_name(name, clean_name, system)
+
+
+def _analyze_clean_name(name, clean_name, system):
+    """analyze_name for an already cleaned name (cache lookup and letter scoring)."""
+    instrumented = instrumentation.enabled
+    if instrumented:
+        cleaned = time.perf_counter()
+    cache_key = clean_name if system is _default_system else (system, clean_name)
+    cache = _name_cache
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if instrumented:
+            instrumentation.count('name_cache.hits' if cached is not None else 'name_cache.misses')
+        if cached is not None:
+            return NameAnalysis(name, clean_name, *cached)
+
+    # Letter values and vowel classes come from 256-entry tables, one C call each
+    letters = clean_name.encode('ascii')
+    expression_sum = sum(letters.translate(system.value_table))
+    soul_urge_sum = sum(letters.translate(system.vowel_value_table))
+    classes = letters.translate(system.class_table)
+    y_seconds = 0.0
+    if system.has_y_rule and numerology_systems.Y_RULE in classes:
+        if instrumented:
+            y_started = time.perf_counter()
+        classes, y_sum = _resolve_y_rule(letters, classes, system)
+        soul_urge_sum += y_sum
+        if instrumented:
+            y_seconds = time.perf_counter() - y_started
+    vowel_flags = tuple(map(bool, classes))
+    analysis = NameAnalysis(name, clean_name, vowel_flags,
+                            expression_sum, soul_urge_sum, expression_sum - soul_urge_sum, system)
+    if instrumented:
+        # Y detection is recorded on its own and excluded from letter scoring
+        instrumentation.record('letter_scoring', time.perf_counter() - cleaned - y_seconds)
+        if 'Y' in clean_name:
+            instrumentation.record('y_vowel_detection', y_seconds)
+    if cache is not None:
+        cache.put(cache_key, analysis[2:])
+    return analysis
+
+
+def _resolve_y_rule(letters, classes, system):
+    """
+    Decides every Y_RULE letter like is_y_vowel: a vowel only with a consonant
+    before it and a consonant (or the end) after it. Returns (classes with 0/1
+    only, sum of the values of the Ys that became vowels).
+    """
+    vowel = numerology_systems.VOWEL
+    resolved = bytearray(classes)
+    last = len(classes) - 1
+    y_sum = 0
+    index = classes.find(numerology_systems.Y_RULE)
+    while index >= 0:
+        is_vowel = index > 0 and classes[index - 1] != vowel and (index == last or classes[index + 1] != vowel)
+        resolved[index] = is_vowel
+        if is_vowel:
+            y_sum += system.value_table[letters[index]]
+        index = classes.find(numerology_systems.Y_RULE, index + 1)
+    return bytes(resolved), y_sum
+
+
+def _name_result(kind, total, analysis, with_log, as_record):
+    """Builds one name calculator's result from a NameAnalysis."""
+    if instrumentation.enabled:
+        instrumentation.count(f'calls.{kind}')
+    steps = [('header', kind, analysis.name, analysis.clean_name), ('letters', kind, analysis)] if with_log else None
+    return _finish(total, steps, as_record, analysis.system)
+
+
 # --- Calculation Functions ---
+# Each calculator takes with_log (record the steps for the log) and as_record
+# (return a NumerologyResult with a lazily rendered log instead of a plain dict).
+# The three name calculators are views over analyze_name.
 
-def calculate_expression(name):
+def calculate_expression(name, with_log=True, as_record=False, analysis=None):
     """Calculates the Expression Number from the full name."""
-    clean_name = re.sub(r'[^A-Z]', '', name.upper()) # Keep only letters
-    total = 0
-    log = [f"Calculating Expression for: {name} -> {clean_name}"]
-    for i, letter in enumerate(clean_name): # ensure 'i' is used if needed by is_y_vowel, though it's not in your original
-        value = letter_values.get(letter, 0)
-        total += value
-        log.append(f"  '{letter}' = {value}")
-    log.append(f"  Total Sum = {total}")
-
-    reduction_result = reduce_number(total)
-    log.append(reduction_result['log']) # Append reduction log
-    return {'number': reduction_result['final'], 'sum': total, 'log': "\n".join(log)}
-
-def calculate_soul_urge(name):
-    """Calculates the Soul Urge Number from vowels in the full name."""
-    clean_name = re.sub(r'[^A-Z]', '', name.upper())
-    total = 0
-    log = [f"Calculating Soul Urge for: {name} -> {clean_name}"]
-    for i, letter in enumerate(clean_name): # 'i' is the index
-        if letter in VOWELS or (letter == 'Y' and is_y_vowel(clean_name, i)):
-            value = letter_values.get(letter, 0)
-            total += value
-            log.append(f"  '{letter}' (Vowel) = {value}")
-        else:
-             log.append(f"  '{letter}' (Consonant) skipped")
-    log.append(f"  Total Sum = {total}")
+    analysis = analysis or analyze_name(name)
+    return _name_result('Expression', analysis.expression_sum, analysis, with_log, as_record)
 
-    reduction_result = reduce_number(total)
-    log.append(reduction_result['log'])
-    return {'number': reduction_result['final'], 'sum': total, 'log': "\n".join(log)}
+def calculate_soul_urge(name, with_log=True, as_record=False, analysis=None):
+    """Calculates the Soul Urge Number from vowels in the full name."""
+    analysis = analysis or analyze_name(name)
+    return _name_result('Soul Urge', analysis.soul_urge_sum, analysis, with_log, as_record)
 
-def calculate_personality(name):
+def calculate_personality(name, with_log=True, as_record=False, analysis=None):
     """Calculates the Personality Number from consonants in the full name."""
-    clean_name = re.sub(r'[^A-Z]', '', name.upper())
-    total = 0
-    log = [f"Calculating Personality for: {name} -> {clean_name}"]
-    for i, letter in enumerate(clean_name): # 'i' is the index
-        if letter not in VOWELS and not (letter == 'Y' and is_y_vowel(clean_name, i)):
-            value = letter_values.get(letter, 0)
-            total += value
-            log.append(f"  '{letter}' (Consonant) = {value}")
-        else:
-            log.append(f"  '{letter}' (Vowel) skipped")
+    analysis = analysis or analyze_name(name)
+    return _name_result('Personality', analysis.personality_sum, analysis, with_log, as_record)
 
-    log.append(f"  Total Sum = {total}")
+# Days per month (index 1-12) and digit sums of 0..9999 for the arithmetic date path
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_DIGIT_SUMS = tuple(sum_digits(n) for n in range(10000))
+_ZERO_DIGITS = 8 * ord('0') # Offset of the 8 ASCII digits in YYYY-MM-DD
 
-    reduction_result = reduce_number(total)
-    log.append(reduction_result['log'])
-    return {'number': reduction_result['final'], 'sum': total, 'log': "\n".join(log)}
+def _is_leap_year(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
 
-def calculate_life_path(birth_date_str):
+def _parse_iso_date(text):
     """
-    Calculates the Life Path Number from the birth date (YYYY-MM-DD).
-    Sums Year, Month, Day digits individually.
+    Parses a strict YYYY-MM-DD string with fixed-offset byte arithmetic.
+    Returns (year, month, day, total), raises ValueError for an impossible date,
+    and returns None for anything not in that exact form (left to strptime).
     """
-    log = [f"Calculating Life Path for: {birth_date_str}"]
-    try:
-        # Ensure input is parsed correctly
-        if isinstance(birth_date_str, datetime.date):
-            birth_date = birth_date_str
-        elif isinstance(birth_date_str, datetime.datetime):
-             birth_date = birth_date_str.date()
-        else:
-            # This is your original parsing for string input
-            birth_date = datetime.datetime.strptime(birth_date_str, '%Y-%m-%d').date()
+    if len(text) != 10 or text[4] != '-' or text[7] != '-' or not text.isascii():
+        return None
+    digits = text[:4] + text[5:7] + text[8:]
+    if not digits.isdigit():
+        return None
+    c = digits.encode('ascii')
+    year = c[0] * 1000 + c[1] * 100 + c[2] * 10 + c[3] - 1111 * 48
+    month = c[4] * 10 + c[5] - 11 * 48
+    day = c[6] * 10 + c[7] - 11 * 48
+    if year < 1 or not 1 <= month <= 12:
+        raise ValueError(f"Invalid date: {text}")
+    days_in_month = 29 if month == 2 and _is_leap_year(year) else _DAYS_IN_MONTH[month]
+    if not 1 <= day <= days_in_month:
+        raise ValueError(f"Invalid date: {text}")
+    # Leading zeros add nothing, so the digit sum is just the sum of the 8 digits
+    return year, month, day, sum(c) - _ZERO_DIGITS
 
-        year = birth_date.year
-        month = birth_date.month
-        day = birth_date.day
-        log.append(f"  Date parsed: Year={year}, Month={month}, Day={day}")
+def _life_path_digits(birth_date_str):
+    """
+    Parses the birth date and sums the digits of year, month and day.
+    Returns (year, month, day, total); raises ValueError for a bad date string.
+    """
+    # Fast path: strict YYYY-MM-DD strings are parsed arithmetically
+    if isinstance(birth_date_str, str):
+        parsed = _parse_iso_date(birth_date_str)
+        if parsed is not None:
+            return parsed
 
-        # Sum digits of year, month, day (as per original app script logic)
-        total = sum(int(digit) for digit in str(year)) + \
-                sum(int(digit) for digit in str(month)) + \
-                sum(int(digit) for digit in str(day))
+    # Ensure input is parsed correctly
+    if isinstance(birth_date_str, datetime.date):
+        birth_date = birth_date_str
+    elif isinstance(birth_date_str, datetime.datetime):
+         birth_date = birth_date_str.date()
+    else:
+        # This is your original parsing for string input
+        birth_date = datetime.datetime.strptime(birth_date_str, '%Y-%m-%d').date()
 
-        log.append(f"  Digits sum ({year}+{month}+{day}): {total}") # Using concatenated method from Apps Script
+    year = birth_date.year
+    month = birth_date.month
+    day = birth_date.day
 
-        reduction_result = reduce_number(total)
-        log.append(reduction_result['log'])
-        return {'number': reduction_result['final'], 'sum': total, 'log': "\n".join(log)}
+    # Sum digits of year, month, day (as per original app script logic)
+    total = _DIGIT_SUMS[year] + _DIGIT_SUMS[month] + _DIGIT_SUMS[day]
+    return year, month, day, total
+
+def _cached_life_path_digits(birth_date_str):
+    """_life_path_digits behind the precomputed table and the date cache."""
+    if not isinstance(birth_date_str, (str, datetime.date)):
+        return _life_path_digits(birth_date_str)
+    digits = _life_path_table.get(birth_date_str)
+    if digits is not None:
+        return digits
+    cache = _date_cache
+    if cache is None:
+        return _life_path_digits(birth_date_str)
+    digits = cache.get(birth_date_str)
+    if instrumentation.enabled:
+        instrumentation.count('date_cache.hits' if digits is not None else 'date_cache.misses')
+    if digits is None:
+        digits = _life_path_digits(birth_date_str)
+        cache.put(birth_date_str, digits)
+    return digits
+
+def calculate_life_path(birth_date_str, with_log=True, as_record=False):
+    """
+    Calculates the Life Path Number from the birth date (YYYY-MM-DD).
+    Sums Year, Month, Day digits individually.
+    """
+    instrumented = instrumentation.enabled
+    if instrumented:
+        started = time.perf_counter()
+        instrumentation.count('calls.Life Path')
+    steps = [('life_path_header', birth_date_str)] if with_log else None
+    try:
+        year, month, day, total = _cached_life_path_digits(birth_date_str)
+
+        if with_log:
+            steps.append(('date_parsed', year, month, day))
+            steps.append(('date_digits', year, month, day, total)) # Using concatenated method from Apps Script
+            final_str, reduce_step = _reduction_step(total)
+            steps.append(reduce_step)
+        else:
+            final_str, _ = _reduction_step(total)
+        record = NumerologyResult(final_str, total, steps)
 
     except ValueError:
-        log.append("  Error: Invalid date format. Please use YYYY-MM-DD.")
-        return {'number': 'Error', 'sum': 0, 'log': "\n".join(log)}
+        if with_log:
+            steps.append(('date_format_error',))
+        record = NumerologyResult('Error', 0, steps)
     except Exception as e:
-         log.append(f"  An unexpected error occurred: {e}")
-         return {'number': 'Error', 'sum': 0, 'log': "\n".join(log)}
+        if with_log:
+            steps.append(('unexpected_error', e))
+        record = NumerologyResult('Error', 0, steps)
+    if instrumented:
+        instrumentation.record('life_path', time.perf_counter() - started)
+        if record.number == 'Error':
+            instrumentation.count('errors.Error')
+    return record if as_record else record.to_dict()
 
 
 # --- Main Calculation Function ---
-def calculate_all_numerology(full_name, birth_date_str):
+def calculate_all_numerology(full_name, birth_date_str, with_log=True, as_record=False):
     """
     Calculates all core numbers for a given name and birth date.
     Returns a dictionary containing results and logs.
-    Prints logs to console during calculation.
+    Pass with_log=False to skip the logs entirely, or as_record=True to get
+    NumerologyResult records whose logs are only rendered when read.
     """
     # Commenting out print statements as per your request for Streamlit integration
     # print(f"\n--- Calculating Numerology for {full_name}, DOB: {birth_date_str} ---")
 
-    expression = calculate_expression(full_name)
+    analysis = analyze_name(full_name) # Name is cleaned and scanned only once
+
+    expression = calculate_expression(full_name, with_log, as_record, analysis)
     # print("\n" + expression['log']) # Print log as it happens
 
-    soul_urge = calculate_soul_urge(full_name)
+    soul_urge = calculate_soul_urge(full_name, with_log, as_record, analysis)
     # print("\n" + soul_urge['log']) # Print log as it happens
 
-    personality = calculate_personality(full_name)
+    personality = calculate_personality(full_name, with_log, as_record, analysis)
     # print("\n" + personality['log']) # Print log as it happens
 
-    life_path = calculate_life_path(birth_date_str)
+    life_path = calculate_life_path(birth_date_str, with_log, as_record)
     # print("\n" + life_path['log']) # Print log as it happens
 
     results = {
@@ -272,4 +690,640 @@ def calculate_all_numerology(full_name, birth_date_str):
     # Return the results dictionary which contains the final numbers and the logs
     return results
 
+# --- Multiple Numerology Systems ---
+# Expression, Soul Urge and Personality under several registered systems at once,
+# e.g. Pythagorean and Chaldean side by side. The name is cleaned and encoded once;
+# each system only adds its table lookups and its reduction variant.
+
+def _single_digit_final(total):
+    """'single_digit' reduction: digit root 1-9, no master numbers (29 -> '29/2')."""
+    if total <= 9:
+        return str(total)
+    return f"{total}/{1 + (total - 1) % 9}"
+
+
+def reduce_for_system(total, system=None):
+    """Final number string for a total under the system's reduction variant."""
+    system = _default_system if system is None else numerology_systems.get_system(system)
+    if system.reduction == 'single_digit':
+        return _single_digit_final(total)
+    return _reduction_step(total)[0]
+
+
+def _resolve_systems(systems):
+    if systems is None:
+        systems = numerology_systems.system_names()
+    return [numerology_systems.get_system(system) for system in systems]
+
+
+def calculate_name_numbers(full_name, systems=None):
+    """
+    Calculates the name numbers under several systems (default: every registered one).
+    Returns {system name: {"Expression"/"Soul Urge"/"Personality": {'number', 'sum'}}}.
+    """
+    clean_name = name_normalization.normalize_name(full_name)
+    results = {}
+    for system in _resolve_systems(systems):
+        analysis = _analyze_clean_name(full_name, clean_name, system)
+        sums = {number_name: getattr(analysis, f"{key}_sum") for number_name, key in NAME_NUMBER_TYPES.items()}
+        results[system.name] = {number_name: {'number': reduce_for_system(total, system), 'sum': total}
+                                for number_name, total in sums.items()}
+    return results
+
+
+# --- Batch (NumPy) Calculation Functions ---
+# These mirror the scalar functions above but work on whole arrays of names and
+# dates at once. Results must match the scalar functions exactly.
+
+# Lookup table: byte code -> True for A-Z (letter values and vowel classes come from
+# the numerology system's tables, see numerology_systems)
+_LETTER_TABLE = np.zeros(256, dtype=bool)
+_LETTER_TABLE[ord('A'):ord('Z') + 1] = True
+
+_MASTER_NUMBERS = np.array([11, 22, 33, 44, 55, 66, 77, 88, 99], dtype=np.int64)
+
+# Rule codes produced by reduce_number_batch (match the Rule numbers in reduce_number)
+RULE_1, RULE_3, RULE_4, RULE_5, RULE_7, RULE_8A, RULE_8B, RULE_9 = 1, 3, 4, 5, 7, 8, 81, 9
+
+
+def sum_digits_array(values):
+    """Vectorized sum_digits for an array of non-negative integers."""
+    n = np.asarray(values, dtype=np.int64).copy()
+    s = np.zeros_like(n)
+    while np.any(n > 0):
+        s += n % 10
+        n //= 10
+    return s
+
+
+def _encode_names(names):
+    """
+    Encodes upper-cased names into one uint8 buffer plus a row id per byte.
+    Batches with non-ASCII characters are cleaned per name with
+    name_normalization first, so accented letters fold exactly like analyze_name.
+    Row ids come from the name lengths, so no byte of a name can start a new row.
+    """
+    names = [str(name) for name in names]
+    text = "".join(names)
+    if not text.isascii():
+        names = name_normalization.normalize_names(names)
+        text = "".join(names)
+    codes = np.frombuffer(text.upper().encode('ascii'), dtype=np.uint8)
+    lengths = np.fromiter(map(len, names), dtype=np.int64, count=len(names))
+    rows = np.repeat(np.arange(len(names), dtype=np.int64), lengths)
+    if len(rows) != len(codes):
+        raise ValueError("Encoded names do not line up with their row ids")
+    return codes, rows
+
+
+def _encode_letters(names):
+    """
+    Encodes names and keeps only their A-Z letters, exactly like
+    name_normalization.normalize_name. Returns (codes, rows, has_prev, has_next,
+    count): has_prev/has_next mark letters with a neighbor in the same cleaned name.
+    """
+    names = list(names)
+    codes, rows = _encode_names(names)
+    letter_mask = _LETTER_TABLE[codes]
+    codes = codes[letter_mask]
+    rows = rows[letter_mask]
+    has_prev = np.zeros(len(codes), dtype=bool)
+    has_next = np.zeros(len(codes), dtype=bool)
+    if len(codes) > 1:
+        has_prev[1:] = rows[1:] == rows[:-1]
+        has_next[:-1] = rows[:-1] == rows[1:]
+    return codes, rows, has_prev, has_next, len(names)
+
+
+def _score_letters(encoded, system):
+    """Expression, Soul Urge and Personality sums of encoded names under one system."""
+    codes, rows, has_prev, has_next, count = encoded
+    values = system.value_array[codes]
+    classes = system.class_array[codes]
+    vowel_mask = classes == numerology_systems.VOWEL
+
+    if system.has_y_rule:
+        # Neighbors inside the cleaned name (same row), mirroring is_y_vowel
+        prev_is_vowel = np.zeros(len(codes), dtype=bool)
+        next_is_vowel = np.zeros(len(codes), dtype=bool)
+        prev_is_vowel[1:] = vowel_mask[:-1]
+        next_is_vowel[:-1] = vowel_mask[1:]
+
+        # An edge counts as "in vowels" in is_y_vowel ('' in 'AEIOU' is True), so Y is a
+        # vowel only with a consonant before it and a consonant (or the end) after it.
+        prev_ok = has_prev & ~prev_is_vowel
+        next_ok = ~has_next | ~next_is_vowel
+        y_vowel = (classes == numerology_systems.Y_RULE) & prev_ok & next_ok
+        vowel_mask = vowel_mask | y_vowel
+
+    expression = np.bincount(rows, weights=values, minlength=count).astype(np.int64)
+    soul_urge = np.bincount(rows[vowel_mask], weights=values[vowel_mask], minlength=count).astype(np.int64)
+    if len(expression) != count:
+        raise ValueError(f"Scored {len(expression)} names for a batch of {count}")
+    personality = expression - soul_urge
+    return {'expression': expression, 'soul_urge': soul_urge, 'personality': personality}
+
+
+def analyze_names_batch(names, system=None):
+    """
+    Computes Expression, Soul Urge and Personality sums for many names at once.
+    Returns a dictionary of int64 arrays: 'expression', 'soul_urge', 'personality'.
+    """
+    system = _default_system if system is None else numerology_systems.get_system(system)
+    return _score_letters(_encode_letters(names), system)
+
+
+def reduce_number_batch(nums):
+    """
+    Vectorized reduce_number for an array of non-negative integers.
+    Returns a dictionary of arrays: 'initial', 'r1', 'r2', 'r3' (-1 where the step
+    was not reached), 'rule' and 'final' (object array of strings).
+    Values covered by the reduction table are gathered from it directly.
+    """
+    num = np.asarray(nums, dtype=np.int64)
+    table = _reduction_table
+    if table is None:
+        return _reduce_number_batch_rules(num)
+
+    in_table = (num >= 0) & (num < table.size)
+    if in_table.all():
+        return {'initial': num, 'r1': table.r1[num], 'r2': table.r2[num], 'r3': table.r3[num],
+                'rule': table.rule[num], 'final': table.final[num]}
+
+    result = {'initial': num}
+    outside = _reduce_number_batch_rules(num[~in_table])
+    indexes = num[in_table]
+    for key in ('r1', 'r2', 'r3', 'rule', 'final'):
+        column = np.empty(num.shape, dtype=outside[key].dtype)
+        column[in_table] = getattr(table, key)[indexes]
+        column[~in_table] = outside[key]
+        result[key] = column
+    return result
+
+
+def _reduce_number_batch_rules(num):
+    """Applies the reduction rules as masked array operations."""
+    r1 = np.full(num.shape, -1, dtype=np.int64)
+    r2 = np.full(num.shape, -1, dtype=np.int64)
+    r3 = np.full(num.shape, -1, dtype=np.int64)
+    rule = np.zeros(num.shape, dtype=np.int64)
+
+    # Rule 1: Initial <= 19 or Master
+    pending = ~((num <= 19) | np.isin(num, _MASTER_NUMBERS))
+    rule[~pending] = RULE_1
+
+    # Rule 2: First Reduction
+    r1[pending] = sum_digits_array(num[pending])
+
+    # Rule 3: R1 is Master
+    hit = pending & np.isin(r1, _MASTER_NUMBERS)
+    rule[hit] = RULE_3
+    pending &= ~hit
+
+    # Rules 4 and 5: R1 <= 19
+    small = pending & (r1 <= 19)
+    rule[small & (num < 100)] = RULE_4
+    rule[small & (num >= 100)] = RULE_5
+    pending &= ~small
+
+    # Rule 6: Second Reduction
+    r2[pending] = sum_digits_array(r1[pending])
+
+    # Rule 7: R2 is Master
+    hit = pending & np.isin(r2, _MASTER_NUMBERS)
+    rule[hit] = RULE_7
+    pending &= ~hit
+
+    # Rule 8: num >= 100 and R1 > 19
+    big = pending & (num >= 100)
+    rule[big & (r2 <= 19)] = RULE_8A
+    deep = big & (r2 > 19)
+    r3[deep] = sum_digits_array(r2[deep])
+    rule[deep] = RULE_8B
+    pending &= ~big
+
+    # Rule 9: Default
+    rule[pending] = RULE_9
+
+    return {'initial': num, 'r1': r1, 'r2': r2, 'r3': r3, 'rule': rule,
+            'final': _render_finals(num, r1, r2, r3, rule)}
+
+
+def _format_final(rule, num, r1, r2, r3):
+    """Builds the final string for one reduction, same formats as reduce_number."""
+    if rule == RULE_1:
+        return str(num)
+    if rule in (RULE_3, RULE_5):
+        return str(r1)
+    if rule == RULE_4:
+        return f"{num}/{r1}"
+    if rule == RULE_7:
+        return str(r2)
+    if rule == RULE_8A:
+        return f"{r1}/{r2}"
+    if rule == RULE_8B:
+        return f"{r1}/{r3}"
+    return f"{num}/{r2}"
+
+
+def _render_finals(num, r1, r2, r3, rule):
+    """Renders final strings once per distinct number and scatters them back."""
+    finals = np.empty(num.shape, dtype=object)
+    if num.size == 0:
+        return finals
+    unique_nums, first_index, inverse = np.unique(num, return_index=True, return_inverse=True)
+    rendered = np.array([
+        _format_final(int(rule[i]), int(num[i]), int(r1[i]), int(r2[i]), int(r3[i]))
+        for i in first_index
+    ], dtype=object)
+    finals[:] = rendered[inverse.reshape(num.shape)]
+    return finals
+
+
+def _iso_digits_batch(texts):
+    """
+    Vectorized _parse_iso_date for a list of strings.
+    Returns (years, months, days, totals, strict, valid): strict marks rows in exact
+    YYYY-MM-DD form, valid marks strict rows that are real calendar dates.
+    """
+    count = len(texts)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=count)
+    codes = np.array(texts, dtype='U10').view(np.uint32).reshape(count, 10).astype(np.int64)
+    digits = codes[:, [0, 1, 2, 3, 5, 6, 8, 9]] - ord('0')
+    strict = ((lengths == 10) & (codes[:, 4] == ord('-')) & (codes[:, 7] == ord('-'))
+              & np.all((digits >= 0) & (digits <= 9), axis=1))
+
+    years = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    months = digits[:, 4] * 10 + digits[:, 5]
+    days = digits[:, 6] * 10 + digits[:, 7]
+    totals = digits.sum(axis=1)
+
+    month_ok = (months >= 1) & (months <= 12)
+    leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+    days_in_month = np.asarray(_DAYS_IN_MONTH)[np.where(month_ok, months, 0)] + (leap & (months == 2))
+    valid = strict & (years >= 1) & month_ok & (days >= 1) & (days <= days_in_month)
+    return years, months, days, totals, strict, valid
+
+
+def _datetime64_digits_batch(values):
+    """Year/month/day and digit sums for a datetime64 array (NaT rows are invalid)."""
+    values = values.astype('datetime64[D]')
+    valid = ~np.isnat(values)
+    safe = np.where(valid, values, np.datetime64('2000-01-01', 'D'))
+    years = safe.astype('datetime64[Y]').astype(np.int64) + 1970
+    months = safe.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    days = (safe - safe.astype('datetime64[M]')).astype(np.int64) + 1
+    valid &= (years >= 1) & (years <= 9999)
+    totals = sum_digits_array(np.where(valid, years, 0)) + sum_digits_array(months) + sum_digits_array(days)
+    totals[~valid] = 0
+    return years, months, days, totals, valid
+
+
+def life_path_digits_batch(birth_dates):
+    """
+    Parses many birth dates and sums their digits, like _life_path_digits per row.
+    Accepts a datetime64 array, or any sequence of YYYY-MM-DD strings and date objects.
+    Strict YYYY-MM-DD strings are parsed in bulk with array arithmetic; other rows
+    take the scalar path. Returns (years, months, days, totals, valid) arrays; rows
+    that cannot be parsed are marked invalid instead of raising.
+    """
+    if isinstance(birth_dates, np.ndarray) and np.issubdtype(birth_dates.dtype, np.datetime64):
+        return _datetime64_digits_batch(birth_dates)
+
+    birth_dates = list(birth_dates)
+    count = len(birth_dates)
+    years = np.zeros(count, dtype=np.int64)
+    months = np.zeros(count, dtype=np.int64)
+    days = np.zeros(count, dtype=np.int64)
+    totals = np.zeros(count, dtype=np.int64)
+    valid = np.zeros(count, dtype=bool)
+
+    string_rows = np.array([isinstance(d, str) for d in birth_dates], dtype=bool)
+    string_index = np.flatnonzero(string_rows)
+    other_rows = np.flatnonzero(~string_rows)
+    if len(string_index):
+        texts = [birth_dates[i] for i in string_index]
+        y, m, d, t, strict, ok = _iso_digits_batch(texts)
+        years[string_index] = y
+        months[string_index] = m
+        days[string_index] = d
+        totals[string_index] = t
+        valid[string_index] = ok
+        # Strings not in strict form (e.g. '1999-2-3') go through strptime
+        other_rows = np.concatenate([other_rows, string_index[~strict]])
+
+    for i in other_rows.tolist():
+        try:
+            years[i], months[i], days[i], totals[i] = _life_path_digits(birth_dates[i])
+            valid[i] = True
+        except Exception:
+            valid[i] = False
+    totals[~valid] = 0
+    return years, months, days, totals, valid
+
+
+def calculate_life_path_batch(birth_dates):
+    """
+    Calculates Life Path numbers for many birth dates at once.
+    Returns {'number': object array of strings, 'sum': int64 array}.
+    Invalid dates get number 'Error' and sum 0, like calculate_life_path,
+    without aborting the rest of the batch.
+    """
+    _, _, _, totals, valid = life_path_digits_batch(birth_dates)
+    numbers = reduce_number_batch(totals)['final']
+    numbers[~valid] = 'Error'
+    return {'number': numbers, 'sum': totals}
+
+
+def calculate_all_numerology_batch(full_names, birth_dates):
+    """
+    Batch version of calculate_all_numerology for parallel sequences of names and
+    birth dates. Returns the same keys as calculate_all_numerology, but each entry is
+    {'number': object array of final strings, 'sum': int64 array} and no logs are built.
+    This is the dictionary view of calculate_all_numerology_columns.
+    """
+    return calculate_all_numerology_columns(full_names, birth_dates).to_dict()
+
+
+def _system_finals_batch(totals, system):
+    """Final strings for an array of totals under the system's reduction variant."""
+    if system.reduction == 'single_digit':
+        unique_totals, inverse = np.unique(totals, return_inverse=True)
+        rendered = np.array([_single_digit_final(total) for total in unique_totals.tolist()], dtype=object)
+        return rendered[inverse.reshape(-1)]
+    return reduce_number_batch(totals)['final']
+
+
+def calculate_name_numbers_batch(full_names, systems=None):
+    """
+    Batch version of calculate_name_numbers: names are encoded once and scored under
+    every system. Returns {system name: {number type: {'number': object array, 'sum': int64 array}}}.
+    """
+    encoded = _encode_letters(full_names)
+    results = {}
+    for system in _resolve_systems(systems):
+        sums = _score_letters(encoded, system)
+        results[system.name] = {number_name: {'number': _system_finals_batch(sums[key], system), 'sum': sums[key]}
+                                for number_name, key in NAME_NUMBER_TYPES.items()}
+    return results
+
+
+# --- Compact Result Types ---
+# NumberResult is a slotted record for one number without its log. A batch is kept
+# as a NumerologyBatch: per number type, parallel arrays of sums, reduction steps
+# (r1/r2/r3, -1 where not reached), rule codes and small-int codes into the list of
+# distinct final strings. The arrays are exported to NumPy/Arrow without copying.
+
+@dataclass(frozen=True)
+class NumberResult:
+    """One calculated number: final string, initial sum and reduction steps (None if not reached)."""
+    __slots__ = ('number', 'sum', 'r1', 'r2', 'r3', 'rule')
+    number: str
+    sum: int
+    r1: object
+    r2: object
+    r3: object
+    rule: int # One of the RULE_* codes, 0 for errors
+
+    def to_dict(self):
+        return {'number': self.number, 'sum': self.sum}
+
+
+def reduction_details(num):
+    """
+    Reduces num like reduce_number and returns a NumberResult with the intermediate
+    steps (NumPy integers are accepted too); negative and non-integer input gives
+    'Invalid Input' with rule 0.
+    """
+    if isinstance(num, np.integer):
+        num = int(num)
+    elif isinstance(num, float) and num == 0:
+        num = 0 # reduce_number accepts a zero float
+    if not isinstance(num, int) or num < 0:
+        return NumberResult('Invalid Input', num, None, None, None, 0)
+    table = _reduction_table
+    if table is not None and num < table.size:
+        r1, r2, r3, rule, final_str = table.entries[num]
+        return NumberResult(final_str, num, r1, r2, r3, rule)
+    reduced = reduce_number_batch(np.array([num], dtype=np.int64))
+    steps = [int(reduced[key][0]) for key in ('r1', 'r2', 'r3')]
+    return NumberResult(reduced['final'][0], int(num), *[v if v >= 0 else None for v in steps],
+                        int(reduced['rule'][0]))
+
+
+class NumberColumn:
+    """One number type of a batch: parallel arrays plus the distinct final strings."""
+    __slots__ = ('sum', 'r1', 'r2', 'r3', 'rule', 'code', 'categories')
+
+    def __init__(self, total, r1, r2, r3, rule, code, categories):
+        self.sum = total          # int64
+        self.r1 = r1              # int16, -1 where not reached
+        self.r2 = r2
+        self.r3 = r3
+        self.rule = rule          # int8 RULE_* code, 0 for errors
+        self.code = code          # uint16 index into categories
+        self.categories = categories # Distinct final strings
+
+    def __len__(self):
+        return len(self.sum)
+
+    def numbers(self):
+        """Final strings as an object array (one shared str object per distinct final)."""
+        return np.array(self.categories, dtype=object)[self.code]
+
+    def result(self, index):
+        steps = [int(self.r1[index]), int(self.r2[index]), int(self.r3[index])]
+        return NumberResult(self.categories[self.code[index]], int(self.sum[index]),
+                            *[v if v >= 0 else None for v in steps], int(self.rule[index]))
+
+
+def _number_column(totals, valid=None):
+    """
+    Builds a NumberColumn from sums. Each distinct sum is reduced once and each
+    distinct final string stored once. Rows where valid is False become 'Error'.
+    """
+    totals = np.asarray(totals, dtype=np.int64)
+    unique_totals, inverse = np.unique(totals, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    reduced = reduce_number_batch(unique_totals)
+    categories, final_codes = np.unique(reduced['final'].astype(str), return_inverse=True)
+    categories = categories.tolist()
+    code_dtype = np.uint16 if len(categories) < 65535 else np.int32
+    code = final_codes.reshape(-1).astype(code_dtype)[inverse]
+    r1, r2, r3 = (reduced[key].astype(np.int16)[inverse] for key in ('r1', 'r2', 'r3'))
+    rule = reduced['rule'].astype(np.int8)[inverse]
+    if valid is not None and not valid.all():
+        invalid = ~valid
+        categories.append('Error')
+        code[invalid] = len(categories) - 1
+        for column in (r1, r2, r3):
+            column[invalid] = -1
+        rule[invalid] = 0
+    return NumberColumn(totals, r1, r2, r3, rule, code, categories)
+
+
+class NumerologyBatch:
+    """Columnar results of calculate_all_numerology_columns, keyed by number type."""
+    __slots__ = ('columns',)
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, number_type):
+        return self.columns[number_type]
+
+    def row(self, index):
+        """{number type: NumberResult} for one row."""
+        return {number_type: column.result(index) for number_type, column in self.columns.items()}
+
+    def to_dict(self):
+        """Compatibility view: {number type: {'number': object array, 'sum': int64 array}}."""
+        return {number_type: {'number': column.numbers(), 'sum': column.sum}
+                for number_type, column in self.columns.items()}
+
+    def to_numpy(self):
+        """
+        Flat {column name: array} view without copies, e.g. 'life_path_sum',
+        'life_path_r1', 'life_path_code'; decode codes with categories().
+        """
+        arrays = {}
+        for number_type, prefix in NUMBER_TYPES.items():
+            column = self.columns[number_type]
+            for field in ('sum', 'r1', 'r2', 'r3', 'rule', 'code'):
+                arrays[f"{prefix}_{field}"] = getattr(column, field)
+        return arrays
+
+    def categories(self):
+        """{prefix: list of final strings} for decoding the *_code arrays."""
+        return {prefix: self.columns[number_type].categories for number_type, prefix in NUMBER_TYPES.items()}
+
+    def to_arrow(self):
+        """
+        pyarrow Table with one dictionary-encoded string column per number type plus
+        its sum/r1/r2/r3/rule columns. Numeric buffers are shared with NumPy (needs pyarrow).
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise RuntimeError("Arrow export requires the 'pyarrow' package (pip install pyarrow)")
+        arrays = {}
+        for number_type, prefix in NUMBER_TYPES.items():
+            column = self.columns[number_type]
+            arrays[prefix] = pyarrow.DictionaryArray.from_arrays(
+                pyarrow.array(column.code), pyarrow.array(column.categories, type=pyarrow.string()))
+            for field in ('sum', 'r1', 'r2', 'r3', 'rule'):
+                arrays[f"{prefix}_{field}"] = pyarrow.array(getattr(column, field))
+        return pyarrow.table(arrays)
+
+
+def calculate_all_numerology_columns(full_names, birth_dates):
+    """
+    Calculates all core numbers for parallel sequences of names and birth dates and
+    returns them as a compact NumerologyBatch (no logs).
+    """
+    full_names = list(full_names)
+    if not isinstance(birth_dates, np.ndarray):
+        birth_dates = list(birth_dates)
+    if len(full_names) != len(birth_dates):
+        raise ValueError("full_names and birth_dates must have the same length")
+
+    _, _, _, totals, valid = life_path_digits_batch(birth_dates)
+    columns = {"Life Path": _number_column(totals, valid)}
+    name_sums = analyze_names_batch(full_names)
+    for number_type, key in NAME_NUMBER_TYPES.items():
+        columns[number_type] = _number_column(name_sums[key])
+    return NumerologyBatch(columns)
+
+
+# --- Precomputed Reduction Table ---
+
+def _render_reduction_log(num, r1, r2, r3, rule, final_str):
+    """Renders the reduce_number log for a table entry (same text as the rule logic)."""
+    log = [f"Reducing: {num}"]
+    if rule == RULE_1:
+        log.append(f" -> Rule 1: Initial <= 19 or Master. Final: {final_str}")
+        return "\n".join(log)
+    log.append(f" -> R1 = sum_digits({num}) = {r1}")
+    if rule == RULE_3:
+        log.append(f" -> Rule 3: R1 is Master. Final: {final_str}")
+    elif rule == RULE_4:
+        log.append(f" -> Rule 4: R1 <= 19 and num < 100. Final: {final_str}")
+    elif rule == RULE_5:
+        log.append(f" -> Rule 5: R1 <= 19 and num >= 100. Final: {final_str}")
+    else:
+        log.append(f" -> R2 = sum_digits({r1}) = {r2}")
+        if rule == RULE_7:
+            log.append(f" -> Rule 7: R2 is Master. Final: {final_str}")
+        elif rule == RULE_8A:
+            log.append(f" -> Rule 8a: num >= 100, R1 > 19, R2 <= 19. Final: {final_str}")
+        elif rule == RULE_8B:
+            log.append(f" -> R3 = sum_digits({r2}) = {r3}")
+            log.append(f" -> Rule 8b: num >= 100, R1 > 19, R2 > 19. Final: {final_str}")
+        else:
+            log.append(f" -> Rule 9: Default (num < 100, R1 > 19). Final: {final_str}")
+    return "\n".join(log)
+
+
+class ReductionTable:
+    """
+    reduce_number results for every number 0 <= num < size.
+    Holds NumPy columns (r1/r2/r3 are -1 where the step was not reached) for the
+    batch calculators, plus a list of plain tuples for scalar lookups.
+    Logs are not stored; they are rendered from the rule code when needed.
+    """
+
+    def __init__(self, r1, r2, r3, rule, final):
+        self.r1 = np.asarray(r1, dtype=np.int64)
+        self.r2 = np.asarray(r2, dtype=np.int64)
+        self.r3 = np.asarray(r3, dtype=np.int64)
+        self.rule = np.asarray(rule, dtype=np.int64)
+        self.final = np.asarray(final, dtype=object)
+        self.size = len(self.rule)
+        self.entries = [
+            (a if a >= 0 else None, b if b >= 0 else None, c if c >= 0 else None, r, f)
+            for a, b, c, r, f in zip(self.r1.tolist(), self.r2.tolist(), self.r3.tolist(),
+                                     self.rule.tolist(), self.final.tolist())
+        ]
+
+
+def build_reduction_table(size=REDUCTION_TABLE_SIZE):
+    """Computes a ReductionTable for 0..size-1 using the vectorized rule logic."""
+    reduced = _reduce_number_batch_rules(np.arange(size, dtype=np.int64))
+    return ReductionTable(reduced['r1'], reduced['r2'], reduced['r3'], reduced['rule'], reduced['final'])
+
+
+def save_reduction_table(path, table=None):
+    """Serializes a reduction table (the active one by default) to a NumPy .npz file."""
+    table = table or _reduction_table
+    np.savez(path, r1=table.r1, r2=table.r2, r3=table.r3, rule=table.rule,
+             final=table.final.astype(str))
+
+
+def load_reduction_table(path):
+    """Loads a reduction table written by save_reduction_table."""
+    with np.load(path) as data:
+        return ReductionTable(data['r1'], data['r2'], data['r3'], data['rule'],
+                              data['final'].astype(object))
+
+
+def set_reduction_table(table=None, size=None, path=None):
+    """
+    Replaces the active reduction table used by reduce_number and the batch paths.
+    Pass a ReductionTable, a size to build, or a path to a saved table.
+    Passing nothing disables the table (every call uses the rule logic).
+    """
+    global _reduction_table
+    if table is None and path is not None:
+        table = load_reduction_table(path)
+    elif table is None and size is not None:
+        table = build_reduction_table(size)
+    _reduction_table = table
+    return table
+
+
+_reduction_table = build_reduction_table(REDUCTION_TABLE_SIZE)
+
 # End of file D:\AstroReportTool\numerology_calculator.py
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Registry of numerology systems: letter values, vowel/Y policy and reduction variant.
+
+Each system is compiled when it is created into 256-entry byte tables indexed by
+the byte of an upper-case letter:
+    value_table        letter value (0 for non-letters)
+    class_table        CONSONANT, VOWEL or Y_RULE (Y decided by its neighbors)
+    vowel_value_table  letter value for vowels, 0 otherwise
+The scalar calculators score a cleaned name with bytes.translate() on these
+tables and the batch calculators gather from NumPy views of the same bytes, so a
+system costs the same per letter as any other and several systems can be scored
+from one encoded name.
+
+Example:
+    register_system(NumerologySystem('client_x', {...}, vowels='AEIOUW', y_policy='vowel'))
+    nc.calculate_name_numbers("Jane Doe", ['pythagorean', 'chaldean', 'client_x'])
+"""
+import numpy as np
+
+# Pythagorean values (A=1 ... I=9, J=1 ...), the calculators' default
+PYTHAGOREAN_VALUES = {
+    'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5, 'F': 6, 'G': 7, 'H': 8, 'I': 9,
+    'J': 1, 'K': 2, 'L': 3, 'M': 4, 'N': 5, 'O': 6, 'P': 7, 'Q': 8, 'R': 9,
+    'S': 1, 'T': 2, 'U': 3, 'V': 4, 'W': 5, 'X': 6, 'Y': 7, 'Z': 8
+}
+
+# Chaldean values (1-8, no letter is worth 9)
+CHALDEAN_VALUES = {
+    'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5, 'F': 8, 'G': 3, 'H': 5, 'I': 1,
+    'J': 1, 'K': 2, 'L': 3, 'M': 4, 'N': 5, 'O': 7, 'P': 8, 'Q': 1, 'R': 2,
+    'S': 3, 'T': 4, 'U': 6, 'V': 6, 'W': 6, 'X': 5, 'Y': 1, 'Z': 7
+}
+
+STANDARD_VOWELS = 'AEIOU'
+
+# How Y is classified when it is not listed in a system's vowels:
+#   'rule'      vowel only between a consonant and a consonant/the end (is_y_vowel)
+#   'vowel'     always a vowel
+#   'consonant' never a vowel
+Y_POLICIES = ('rule', 'vowel', 'consonant')
+
+# Reduction variants: 'standard' uses reduce_number's rules (master numbers kept),
+# 'single_digit' reduces to a digit root 1-9 with no master numbers ('29/2')
+REDUCTIONS = ('standard', 'single_digit')
+
+# Codes in class_table
+CONSONANT, VOWEL, Y_RULE = 0, 1, 2
+
+_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+class NumerologySystem:
+    """A letter-value system compiled into 256-entry byte lookup tables."""
+
+    def __init__(self, name, letter_values, vowels=STANDARD_VOWELS, y_policy='rule',
+                 reduction='standard', description=''):
+        letter_values = {str(letter).upper(): value for letter, value in letter_values.items()}
+        vowels = str(vowels).upper()
+        unknown = [letter for letter in list(letter_values) + list(vowels) if letter not in _LETTERS]
+        if unknown:
+            raise ValueError(f"System '{name}': only the letters A-Z can be configured, got {unknown}")
+        if any(not isinstance(value, int) or not 0 <= value <= 255 for value in letter_values.values()):
+            raise ValueError(f"System '{name}': letter values must be integers from 0 to 255")
+        if y_policy not in Y_POLICIES:
+            raise ValueError(f"System '{name}': y_policy must be one of {Y_POLICIES}")
+        if reduction not in REDUCTIONS:
+            raise ValueError(f"System '{name}': reduction must be one of {REDUCTIONS}")
+
+        self.name = name
+        self.letter_values = letter_values
+        self.vowels = vowels
+        self.y_policy = y_policy
+        self.reduction = reduction
+        self.description = description
+
+        values = bytearray(256)
+        classes = bytearray(256)
+        for letter, value in letter_values.items():
+            values[ord(letter)] = value
+        for letter in vowels:
+            classes[ord(letter)] = VOWEL
+        if 'Y' not in vowels:
+            classes[ord('Y')] = {'rule': Y_RULE, 'vowel': VOWEL, 'consonant': CONSONANT}[y_policy]
+        self.value_table = bytes(values)
+        self.class_table = bytes(classes)
+        self.vowel_value_table = bytes(v if c == VOWEL else 0 for v, c in zip(values, classes))
+        self.has_y_rule = classes[ord('Y')] == Y_RULE
+
+        # Zero-copy NumPy views for the batch calculators
+        self.value_array = np.frombuffer(self.value_table, dtype=np.uint8)
+        self.class_array = np.frombuffer(self.class_table, dtype=np.uint8)
+
+    def __repr__(self):
+        return f"NumerologySystem({self.name!r}, y_policy={self.y_policy!r}, reduction={self.reduction!r})"
+
+    def to_dict(self):
+        return {'name': self.name, 'letter_values': dict(self.letter_values), 'vowels': self.vowels,
+                'y_policy': self.y_policy, 'reduction': self.reduction, 'description': self.description}
+
+
+def system_from_dict(data):
+    """Builds a system from a dict such as a client's JSON config (see NumerologySystem.to_dict)."""
+    return NumerologySystem(data['name'], data['letter_values'], data.get('vowels', STANDARD_VOWELS),
+                            data.get('y_policy', 'rule'), data.get('reduction', 'standard'),
+                            data.get('description', ''))
+
+
+# --- Registry ---
+
+_systems = {}
+
+
+def register_system(system, replace=False):
+    """Adds a system to the registry and returns it."""
+    if system.name in _systems and not replace:
+        raise ValueError(f"A numerology system named '{system.name}' is already registered")
+    _systems[system.name] = system
+    return system
+
+
+def get_system(system):
+    """Returns a registered system by name (NumerologySystem instances are returned as is)."""
+    if isinstance(system, NumerologySystem):
+        return system
+    try:
+        return _systems[system]
+    except KeyError:
+        raise ValueError(f"Unknown numerology system '{system}'; registered: {sorted(_systems)}")
+
+
+def system_names():
+    return list(_systems)
+
+
+PYTHAGOREAN = register_system(NumerologySystem(
+    'pythagorean', PYTHAGOREAN_VALUES, description="Pythagorean values, Y by its neighbors"))
+CHALDEAN = register_system(NumerologySystem(
+    'chaldean', CHALDEAN_VALUES, description="Chaldean values (no 9), Y by its neighbors"))
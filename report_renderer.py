@@ -0,0 +1,298 @@
+"""
+Numerology report layout and bulk rendering.
+
+build_report() assembles the report app.py shows: the four numbers in display
+order, each with its initial sum, interpretation blocks from the store and the
+calculation log. ReportRenderer turns reports into standalone HTML pages (or
+PDF, with the optional weasyprint package) using templates compiled at import;
+the HTML for each distinct number string is rendered once and reused.
+write_report_archive() renders many records in a process pool and streams the
+files into a ZIP archive, with only a few chunks in memory at a time.
+
+Example:
+    python report_renderer.py clients.csv reports.zip --workers 8
+    python report_renderer.py clients.csv reports.zip --format pdf --no-log
+"""
+import argparse
+import html
+import os
+import re
+import string
+import sys
+import time
+import zipfile
+
+import numerology_calculator_patched as nc
+import interpretations_store
+import name_normalization
+import bulk_cli
+
+# Results that have no interpretation
+INVALID_NUMBERS = ('Error', 'Invalid Input', 'N/A')
+FORMATS = ('html', 'pdf')
+MISSING_INTERPRETATIONS = "Interpretations for '{}' not shown. Data from 'interpretations.csv' could not be loaded."
+FOOTER = "Numerology calculations are based on the provided script's logic. Interpretations from interpretations.csv."
+
+
+# --- Report layout ---
+
+def build_report(full_name, birth_date, store=None, include_logs=True, results=None):
+    """
+    Calculates (unless results are given) and lays out one report:
+    {'name', 'birth_date', 'sections': [{'number_name', 'number', 'sum',
+    'interpretations' (markdown blocks), 'interpretations_missing', 'log'}]}.
+    interpretations_missing is True when a number has no blocks because no store is loaded.
+    """
+    if results is None:
+        results = nc.calculate_all_numerology(full_name, birth_date, with_log=include_logs, as_record=True)
+    sections = []
+    for number_name in nc.NUMBER_TYPES:
+        if number_name not in results:
+            continue # Should not happen if calculator is correct
+        data = results[number_name]
+        number = data.get('number')
+        has_number = bool(number) and number not in INVALID_NUMBERS
+        sections.append({
+            'number_name': number_name,
+            'number': number,
+            'sum': data.get('sum'),
+            'interpretations': store.render(number) if has_number and store else [],
+            'interpretations_missing': has_number and not store,
+            'log': data.get('log'),
+        })
+    return {'name': full_name, 'birth_date': str(birth_date), 'sections': sections}
+
+
+def build_reports(records, store=None, include_logs=True):
+    """Reports for a list of (name, birth_date) records; without logs the batch engine is used."""
+    records = list(records)
+    if include_logs:
+        return [build_report(name, birth_date, store, True) for name, birth_date in records]
+    batch = nc.calculate_all_numerology_columns([name for name, _ in records],
+                                                [birth_date for _, birth_date in records])
+    columns = {number_name: (column.numbers(), column.sum) for number_name, column in batch.columns.items()}
+    reports = []
+    for i, (name, birth_date) in enumerate(records):
+        results = {number_name: {'number': numbers[i], 'sum': int(sums[i])}
+                   for number_name, (numbers, sums) in columns.items()}
+        reports.append(build_report(name, birth_date, store, False, results))
+    return reports
+
+
+# --- Templates ---
+
+_BOLD = re.compile(r'\*\*(.+?)\*\*', re.S)
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+_PAGE = string.Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Numerology Report - $name</title>
+<style>
+body { font-family: sans-serif; max-width: 46em; margin: 2em auto; padding: 0 1em; color: #222; }
+h2 { display: flex; justify-content: space-between; border-top: 1px solid #ccc; padding-top: 1em; }
+code { background: #f3f3f3; padding: 0 .3em; }
+pre { background: #f7f7f7; padding: 1em; overflow-x: auto; }
+.warning { color: #8a6d00; }
+footer { margin-top: 3em; text-align: center; font-size: small; color: grey; }
+</style>
+</head>
+<body>
+<h1>Your Numerology Report</h1>
+<p>Calculated for: <strong>$name</strong> (DOB: <strong>$birth_date</strong>)</p>
+$sections
+<footer>$footer</footer>
+</body>
+</html>
+""")
+
+_SECTION = string.Template("""<section>
+<h2><span>$number_name Number</span> <code>$number</code></h2>
+<p><strong>Initial Sum:</strong> <code>$sum</code></p>
+$interpretations$log</section>
+""")
+
+_LOG = string.Template("""<details><summary>View Calculation Log for $number_name</summary><pre>$log</pre></details>
+""")
+
+
+def markdown_to_html(text):
+    """HTML for the markdown used in interpretation texts: paragraphs, line breaks, **bold** and --- rules."""
+    parts = []
+    for paragraph in _PARAGRAPH_BREAK.split(text.strip()):
+        if paragraph.strip() == '---':
+            parts.append('<hr>')
+        elif paragraph.strip():
+            escaped = _BOLD.sub(r'<strong>\1</strong>', html.escape(paragraph.strip()))
+            parts.append('<p>' + escaped.replace('\n', '<br>\n') + '</p>')
+    return "\n".join(parts)
+
+
+def report_filename(index, full_name, fmt='html'):
+    """Archive member name for a report, e.g. '000042-jose-nunez.html'."""
+    words = (name_normalization.normalize_name(word).lower() for word in str(full_name).split())
+    slug = '-'.join(word for word in words if word)[:60] or 'report'
+    return f"{index:06d}-{slug}.{fmt}"
+
+
+# --- Rendering ---
+
+class ReportRenderer:
+    """Renders reports to HTML/PDF/markdown; interpretation HTML is cached per number string."""
+
+    def __init__(self, store=None, include_logs=True):
+        self.store = store
+        self.include_logs = include_logs
+        self._interpretation_html = {}
+
+    def report(self, full_name, birth_date, results=None):
+        return build_report(full_name, birth_date, self.store, self.include_logs, results)
+
+    def _interpretations(self, section):
+        if section['interpretations_missing']:
+            message = html.escape(MISSING_INTERPRETATIONS.format(section['number_name']))
+            return f'<p class="warning">{message}</p>\n'
+        number = section['number']
+        rendered = self._interpretation_html.get(number)
+        if rendered is None:
+            rendered = "".join(markdown_to_html(block) + "\n" for block in section['interpretations'])
+            self._interpretation_html[number] = rendered
+        return rendered
+
+    def html(self, report):
+        sections = []
+        for section in report['sections']:
+            number_name = html.escape(section['number_name'])
+            log = ''
+            if self.include_logs:
+                log = _LOG.substitute(number_name=number_name,
+                                      log=html.escape(section['log'] or 'No log available.'))
+            sections.append(_SECTION.substitute(
+                number_name=number_name,
+                number=html.escape(str(section['number'] or 'N/A')),
+                sum=html.escape(str(section['sum'] if section['sum'] is not None else 'N/A')),
+                interpretations=self._interpretations(section),
+                log=log,
+            ))
+        return _PAGE.substitute(name=html.escape(str(report['name'])), birth_date=html.escape(report['birth_date']),
+                                sections="".join(sections), footer=html.escape(FOOTER))
+
+    def pdf(self, report):
+        return html_to_pdf(self.html(report))
+
+    def markdown(self, report):
+        """Plain markdown form of a report (the blocks app.py displays, in order)."""
+        parts = []
+        for section in report['sections']:
+            parts.append(f"#### {section['number_name']} Number\n### `{section['number']}`\n"
+                         f"**Initial Sum:** `{section['sum']}`")
+            parts.extend(section['interpretations'])
+            if self.include_logs and section['log']:
+                parts.append(section['log'])
+        return "\n\n".join(parts)
+
+    def render(self, report, fmt='html'):
+        """The report file contents as bytes in the given format."""
+        if fmt == 'pdf':
+            return self.pdf(report)
+        return self.html(report).encode('utf-8')
+
+
+def _import_weasyprint():
+    try:
+        import weasyprint
+    except ImportError:
+        raise RuntimeError("PDF output requires the 'weasyprint' package (pip install weasyprint)")
+    return weasyprint
+
+
+def html_to_pdf(page):
+    """Converts an HTML page to PDF bytes (needs weasyprint)."""
+    return _import_weasyprint().HTML(string=page).write_pdf()
+
+
+# --- Bulk rendering (runs in worker processes) ---
+
+_worker_renderers = {} # (include_logs) -> ReportRenderer, per process
+
+
+def render_chunk(first_index, chunk, csv_path='interpretations.csv', fmt='html', include_logs=True):
+    """Renders one chunk of (name, birth_date) records; returns [(filename, bytes)]."""
+    store = interpretations_store.get_store(csv_path) if csv_path else None
+    renderer = _worker_renderers.get(include_logs)
+    if renderer is None or renderer.store is not store: # First chunk, or the CSV was reloaded
+        renderer = _worker_renderers[include_logs] = ReportRenderer(store, include_logs)
+    reports = build_reports(chunk, store, include_logs)
+    return [(report_filename(first_index + i, report['name'], fmt), renderer.render(report, fmt))
+            for i, report in enumerate(reports)]
+
+
+def render_chunks(chunks, workers, csv_path='interpretations.csv', fmt='html', include_logs=True):
+    """Yields rendered chunks in input order (see bulk_cli.map_chunks)."""
+    return bulk_cli.map_chunks(render_chunk, chunks, workers, csv_path, fmt, include_logs)
+
+
+def write_report_archive(records, zip_path, csv_path='interpretations.csv', fmt='html', workers=None,
+                         chunk_size=200, include_logs=True, progress=None):
+    """
+    Renders a report for every (name, birth_date) record into a ZIP archive and
+    returns the number of reports written. csv_path=None renders without
+    interpretations; a missing CSV raises FileNotFoundError before any work starts.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported report format: {fmt}")
+    if fmt == 'pdf':
+        _import_weasyprint()
+    if csv_path:
+        interpretations_store.get_store(csv_path)
+    workers = workers or os.cpu_count() or 1
+    compression = zipfile.ZIP_STORED if fmt == 'pdf' else zipfile.ZIP_DEFLATED # PDFs are already compressed
+
+    written = 0
+    started = time.perf_counter()
+    with zipfile.ZipFile(zip_path, 'w', compression=compression) as archive:
+        chunks = bulk_cli.chunk_records(iter(records), chunk_size)
+        for files in render_chunks(chunks, workers, csv_path, fmt, include_logs):
+            for filename, data in files:
+                archive.writestr(filename, data)
+            written += len(files)
+            if progress:
+                bulk_cli.print_progress(progress, written, written, started, unit='reports')
+    return written
+
+
+# --- Main ---
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Render numerology reports for a CSV/JSONL file of people into a ZIP archive.")
+    parser.add_argument('input', help="Input file (.csv or .jsonl) with name and birth date fields")
+    parser.add_argument('output', help="Output ZIP archive")
+    parser.add_argument('--input-format', choices=('csv', 'jsonl'))
+    parser.add_argument('--name-field', default='name', help="Name column/key (default: name)")
+    parser.add_argument('--date-field', default='birth_date', help="Birth date column/key, YYYY-MM-DD (default: birth_date)")
+    parser.add_argument('--format', choices=FORMATS, default='html', help="Report format (pdf needs weasyprint)")
+    parser.add_argument('--interpretations', default='interpretations.csv', help="Interpretations CSV (default: interpretations.csv)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=200, help="Reports per task (default: 200)")
+    parser.add_argument('--no-log', action='store_true', help="Leave out the calculation logs")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        input_format = bulk_cli.detect_format(args.input, args.input_format)
+        records = bulk_cli.read_records(args.input, input_format, args.name_field, args.date_field)
+        started = time.perf_counter()
+        written = write_report_archive(records, args.output, args.interpretations, args.format, args.workers,
+                                       args.chunk_size, not args.no_log, progress=sys.stderr)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Finished: {written} reports in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""
+Reverse lookups: which dates or names produce a given number.
+
+Final numbers are precomputed once with the batch engine and stored in inverted
+indexes (final string -> sorted ids), so queries such as "all dates in 2027 with
+Life Path 22" or "names with Expression 11" are a dictionary lookup plus a
+binary search instead of brute-forcing the calculators. Indexes persist to .npz
+files, and NameIndex grows incrementally as names are added.
+
+Example:
+    dates = DateIndex(datetime.date(1900, 1, 1), datetime.date(2100, 12, 31))
+    dates.query(['22'], start=datetime.date(2027, 1, 1), end=datetime.date(2027, 12, 31))
+    names = NameIndex(baby_names)
+    names.query('Expression', ['11', '29/11'])
+    names.query('Expression', ['2'], final_part=True) # '2', '20/2', ...
+"""
+import datetime
+from array import array
+
+import numpy as np
+
+import numerology_calculator_patched as nc
+
+_EPOCH = datetime.date(1970, 1, 1)
+
+
+def _day_id(day):
+    """Days since 1970-01-01 for a date (ids used by DateIndex)."""
+    return (day - _EPOCH).days
+
+
+def _day_from_id(day_id):
+    return _EPOCH + datetime.timedelta(days=int(day_id))
+
+
+class InvertedIndex:
+    """
+    Maps final number strings to sorted id lists. Ids must be added in increasing
+    order, which keeps every posting list sorted without re-sorting.
+    """
+
+    def __init__(self):
+        self.postings = {}
+
+    def add(self, finals, first_id=0):
+        """Adds ids first_id, first_id + 1, ... for an array of final strings."""
+        finals = np.asarray(finals, dtype=object)
+        if finals.size == 0:
+            return
+        keys, inverse = np.unique(finals.astype(str), return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(keys) + 1))
+        for k, key in enumerate(keys.tolist()):
+            ids = order[bounds[k]:bounds[k + 1]] + first_id
+            postings = self.postings.get(key)
+            if postings is None:
+                postings = self.postings[key] = array('q')
+            postings.extend(ids.tolist())
+
+    def keys(self):
+        return sorted(self.postings, key=lambda s: (len(s), s))
+
+    def ids(self, key):
+        """Sorted ids for one final string (zero-copy view over the posting list)."""
+        postings = self.postings.get(key)
+        if not postings:
+            return np.zeros(0, dtype=np.int64)
+        return np.frombuffer(postings, dtype=np.int64)
+
+    def lookup(self, keys, low=None, high=None):
+        """Sorted ids matching any of the keys, optionally limited to low <= id <= high."""
+        parts = []
+        for key in keys:
+            ids = self.ids(key)
+            if low is not None or high is not None:
+                start = np.searchsorted(ids, low, side='left') if low is not None else 0
+                stop = np.searchsorted(ids, high, side='right') if high is not None else len(ids)
+                ids = ids[start:stop]
+            if len(ids):
+                parts.append(ids)
+        if not parts:
+            return np.zeros(0, dtype=np.int64)
+        if len(parts) == 1:
+            return parts[0].copy()
+        return np.unique(np.concatenate(parts)) # Keys are disjoint, so this just merges
+
+    def counts(self):
+        """Number of ids per final string."""
+        return {key: len(self.postings[key]) for key in self.keys()}
+
+    def to_arrays(self, prefix):
+        """Flattens the index into arrays for np.savez."""
+        keys = self.keys()
+        lengths = [len(self.postings[key]) for key in keys]
+        ids = np.concatenate([self.ids(key) for key in keys]) if keys else np.zeros(0, dtype=np.int64)
+        return {f"{prefix}_keys": np.array(keys, dtype=str),
+                f"{prefix}_offsets": np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]),
+                f"{prefix}_ids": ids}
+
+    @classmethod
+    def from_arrays(cls, data, prefix):
+        index = cls()
+        keys = data[f"{prefix}_keys"].tolist()
+        offsets = data[f"{prefix}_offsets"]
+        ids = data[f"{prefix}_ids"].astype(np.int64)
+        for k, key in enumerate(keys):
+            index.postings[key] = array('q', ids[offsets[k]:offsets[k + 1]].tobytes())
+        return index
+
+
+def _expand_numbers(index, numbers, final_part=False):
+    """Query keys: the numbers themselves, or with final_part=True every key ending in them."""
+    numbers = [numbers] if isinstance(numbers, str) else [str(n) for n in numbers]
+    if not final_part:
+        return numbers
+    wanted = set(numbers)
+    return [key for key in index.postings if key.rsplit('/', 1)[-1] in wanted]
+
+
+# --- Dates ---
+
+class DateIndex:
+    """Life Path final numbers for every date in [start, end]."""
+
+    def __init__(self, start=datetime.date(1900, 1, 1), end=datetime.date(2100, 12, 31), _index=None):
+        if end < start:
+            raise ValueError("end must not be before start")
+        self.start = start
+        self.end = end
+        if _index is not None:
+            self.index = _index
+            return
+        days = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+        results = nc.calculate_life_path_batch(days)
+        self.index = InvertedIndex()
+        self.index.add(results['number'], first_id=_day_id(start))
+
+    def query(self, numbers, start=None, end=None, final_part=False):
+        """
+        Dates (sorted datetime.date list) whose Life Path is any of `numbers`, e.g. ['22']
+        or ['11', '22', '33'], optionally within [start, end]. With final_part=True,
+        '5' also matches '23/5', '32/5', ...
+        """
+        ids = self.query_ids(numbers, start, end, final_part)
+        return [_day_from_id(day_id) for day_id in ids.tolist()]
+
+    def query_ids(self, numbers, start=None, end=None, final_part=False):
+        """Like query, but returns day ids (days since 1970-01-01) as an int64 array."""
+        keys = _expand_numbers(self.index, numbers, final_part)
+        low = _day_id(start) if start is not None else None
+        high = _day_id(end) if end is not None else None
+        return self.index.lookup(keys, low, high)
+
+    def counts(self):
+        return self.index.counts()
+
+    def save(self, path):
+        np.savez(path, kind=np.array('date'), start=np.array(self.start.isoformat()),
+                 end=np.array(self.end.isoformat()), **self.index.to_arrays('life_path'))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if str(data['kind']) != 'date':
+                raise ValueError(f"'{path}' is not a date index")
+            return cls(datetime.date.fromisoformat(str(data['start'])),
+                       datetime.date.fromisoformat(str(data['end'])),
+                       _index=InvertedIndex.from_arrays(data, 'life_path'))
+
+
+# --- Names ---
+
+class NameIndex:
+    """Expression, Soul Urge and Personality final numbers for a growing name corpus."""
+
+    def __init__(self, names=()):
+        self.names = []
+        self.indexes = {number_type: InvertedIndex() for number_type in nc.NAME_NUMBER_TYPES}
+        self.add_names(names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add_names(self, names):
+        """Indexes more names; returns their ids (positions in the corpus)."""
+        names = [str(name) for name in names]
+        first_id = len(self.names)
+        if names:
+            sums = nc.analyze_names_batch(names)
+            for number_type, key in nc.NAME_NUMBER_TYPES.items():
+                finals = nc.reduce_number_batch(sums[key])['final']
+                self.indexes[number_type].add(finals, first_id=first_id)
+            self.names.extend(names)
+        return range(first_id, len(self.names))
+
+    def _index(self, number_type):
+        try:
+            return self.indexes[number_type]
+        except KeyError:
+            raise ValueError(f"Unknown number type '{number_type}'; use one of {list(nc.NAME_NUMBER_TYPES)}")
+
+    def query_ids(self, number_type, numbers, id_range=None, final_part=False):
+        """Sorted ids of names whose number_type is any of `numbers`, optionally within an id range."""
+        index = self._index(number_type)
+        keys = _expand_numbers(index, numbers, final_part)
+        if id_range is None:
+            return index.lookup(keys)
+        if len(id_range) == 0:
+            return np.zeros(0, dtype=np.int64)
+        return index.lookup(keys, id_range[0], id_range[-1])
+
+    def query(self, number_type, numbers, id_range=None, final_part=False):
+        """Names (in corpus order) whose number_type is any of `numbers`, e.g. ('Expression', ['11', '29/11'])."""
+        return [self.names[i] for i in self.query_ids(number_type, numbers, id_range, final_part).tolist()]
+
+    def counts(self, number_type):
+        return self._index(number_type).counts()
+
+    def save(self, path):
+        arrays = {}
+        for number_type, key in nc.NAME_NUMBER_TYPES.items():
+            arrays.update(self.indexes[number_type].to_arrays(key))
+        np.savez(path, kind=np.array('name'), names=np.array(self.names, dtype=str), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if str(data['kind']) != 'name':
+                raise ValueError(f"'{path}' is not a name index")
+            index = cls()
+            index.names = data['names'].tolist()
+            for number_type, key in nc.NAME_NUMBER_TYPES.items():
+                index.indexes[number_type] = InvertedIndex.from_arrays(data, key)
+            return index
@@ -0,0 +1,106 @@
+"""Tests for the ASGI API through InProcessClient."""
+import csv
+
+import pytest
+
+import api_service
+import numerology_calculator_patched as nc
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = str(tmp_path / 'interpretations.csv')
+    with open(path, mode='w', encoding='utf-8', newline='') as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(['key', 'text'])
+        writer.writerows([['Numerology5', 'Five'], ['Numerology23', 'Twenty-three'],
+                          ['Numerology11', 'Interpretation pending']])
+    return path
+
+
+@pytest.fixture
+def client(csv_path):
+    app = api_service.NumerologyApi(workers=2, chunk_size=3, interpretations_csv=csv_path)
+    yield api_service.InProcessClient(app)
+    app.shutdown()
+
+
+def expected_numbers(name, birth_date):
+    results = nc.calculate_all_numerology(name, birth_date, with_log=False)
+    return {number_type: {'number': results[number_type]['number'], 'sum': results[number_type]['sum']}
+            for number_type in nc.NUMBER_TYPES}
+
+
+def test_health(client):
+    assert client.get('/health') == (200, {'status': 'ok'})
+
+
+def test_calculate_matches_the_calculator(client):
+    status, body = client.post('/calculate', {'name': 'Jane Doe', 'birth_date': '1990-05-17', 'with_log': True})
+    assert status == 200
+    expected = nc.calculate_all_numerology('Jane Doe', '1990-05-17')
+    for number_type in nc.NUMBER_TYPES:
+        assert body[number_type] == expected[number_type]
+
+
+def test_calculate_with_interpretations(client):
+    status, body = client.post('/calculate', {'name': 'Jane Doe', 'birth_date': '1990-05-17',
+                                              'interpretations': True})
+    assert status == 200
+    assert all('interpretations' in body[number_type] for number_type in nc.NUMBER_TYPES)
+
+
+@pytest.mark.parametrize('payload', [{'birth_date': '1990-05-17'}, {'name': ' ', 'birth_date': '1990-05-17'},
+                                     {'name': 'Jane', 'birth_date': 19900517}, ['Jane']])
+def test_calculate_rejects_invalid_records(client, payload):
+    status, body = client.post('/calculate', payload)
+    assert status == 400 and 'error' in body
+
+
+def test_calculate_batch_matches_the_calculator(client):
+    records = [{'name': name, 'birth_date': birth_date}
+               for name, birth_date in [('Jane Doe', '1990-05-17'), ('José', '2000-02-30'), ('Mary Lynn', '1984-07-04'),
+                                        ('Ann\x00Lee', '1999-12-31'), ('Bob', 'not a date'), ('Cy', '2024-02-29'),
+                                        ('Yvonne', '1900-01-01')]]
+    status, body = client.post('/calculate/batch', {'records': records})
+    assert status == 200
+    assert body['count'] == len(records)
+    assert body['results'] == [expected_numbers(r['name'], r['birth_date']) for r in records]
+
+
+def test_calculate_batch_empty(client):
+    assert client.post('/calculate/batch', {'records': []}) == (200, {'count': 0, 'results': []})
+
+
+def test_calculate_batch_validation_error_from_a_worker_process(client):
+    records = [{'name': 'Jane', 'birth_date': '1990-05-17'}] * 4 + [{'name': 42, 'birth_date': '1990-05-17'}]
+    status, body = client.post('/calculate/batch', {'records': records})
+    assert status == 400
+    assert body['error'] == "'name' must be a non-empty string (record 4)"
+    assert client.post('/calculate/batch', {'rows': []})[0] == 400
+
+
+def test_interpretation_lookup(client):
+    status, body = client.get('/interpretations/23/5')
+    assert status == 200
+    assert body['number'] == '23/5' and body['placeholder'] is False
+    assert body['blocks'][0] == 'Five'
+    status, body = client.get('/interpretations/11')
+    assert status == 200 and body['placeholder'] is True
+
+
+@pytest.mark.parametrize('number', ['0', '05', '123456', '7', 'x1', '23/abc', 'Error'])
+def test_interpretation_unknown_numbers_are_404(client, number):
+    assert client.get(f'/interpretations/{number}')[0] == 404
+
+
+def test_unknown_routes_and_methods(client):
+    assert client.get('/nope')[0] == 404
+    assert client.get('/calculate')[0] == 405
+
+
+def test_metrics_count_requests(client):
+    client.get('/health')
+    status, text = client.get('/metrics')
+    assert status == 200
+    assert 'numerology_http_request_duration_seconds_count{route="/health",status="200"} 1' in text
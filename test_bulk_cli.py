@@ -0,0 +1,39 @@
+"""Tests for the bulk CLI input readers and resume handling."""
+import json
+
+import pytest
+
+import bulk_cli
+
+
+def test_empty_or_headerless_csv_is_a_value_error(tmp_path):
+    empty = tmp_path / 'empty.csv'
+    empty.write_text('', encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(bulk_cli.read_records(str(empty), 'csv'))
+    assert bulk_cli.main([str(empty), str(tmp_path / 'out.csv')]) == 1
+
+
+def test_jsonl_fields_are_read_as_strings(tmp_path):
+    path = tmp_path / 'in.jsonl'
+    path.write_text('{"name": 123, "birth_date": 19900101}\n{"name": null}\n', encoding='utf-8')
+    assert list(bulk_cli.read_records(str(path), 'jsonl')) == [('123', '19900101'), ('', '')]
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl'])
+def test_resume_truncates_rows_written_after_the_checkpoint(tmp_path, extension):
+    records = [{'name': f'Name {i}', 'birth_date': f'1990-01-{i + 1:02d}'} for i in range(10)]
+    full = tmp_path / 'full.jsonl'
+    part = tmp_path / 'part.jsonl'
+    full.write_text(''.join(json.dumps(r) + '\n' for r in records), encoding='utf-8')
+    part.write_text(''.join(json.dumps(r) + '\n' for r in records[:6]), encoding='utf-8')
+    reference = tmp_path / f'reference.{extension}'
+    output = tmp_path / f'output.{extension}'
+    options = ['--chunk-size', '3', '--workers', '1']
+
+    assert bulk_cli.main([str(full), str(reference)] + options) == 0
+    assert bulk_cli.main([str(part), str(output)] + options) == 0
+    with open(output, 'a', encoding='utf-8') as outfile:
+        outfile.write('6,Name 6,19') # Partial line left by a crash
+    assert bulk_cli.main([str(full), str(output), '--resume'] + options) == 0
+    assert output.read_bytes() == reference.read_bytes()
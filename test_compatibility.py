@@ -0,0 +1,77 @@
+"""Tests for the all-pairs compatibility engine."""
+import numpy as np
+import pytest
+
+import compatibility
+import numerology_calculator_patched as nc
+
+
+def random_profiles(count, seed):
+    rng = np.random.default_rng(seed)
+    # Mostly single digits and master numbers, like real results, plus some 'Error' codes
+    choices = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 22, 33, compatibility.MISSING_CODE])
+    return compatibility.Profiles(rng.choice(choices, size=(count, len(nc.NUMBER_TYPES))))
+
+
+def expected_top_k(matrix, k):
+    """Highest score first, ties by lowest right index."""
+    indexes = np.array([np.lexsort((np.arange(len(row)), -row))[:k] for row in matrix], dtype=np.int64)
+    return indexes, np.take_along_axis(matrix, indexes, axis=1)
+
+
+@pytest.fixture(scope='module')
+def populations():
+    return random_profiles(60, seed=1), random_profiles(45, seed=2)
+
+
+def test_matrix_matches_the_table_lookup(populations):
+    left, right = populations
+    table = compatibility.default_compatibility_table()
+    matrix = compatibility.compatibility_matrix(left, right, tile_size=16)
+    expected = np.zeros_like(matrix)
+    for i in range(len(nc.NUMBER_TYPES)):
+        expected += table[left.codes[:, i][:, None], right.codes[:, i][None, :]] * np.float32(0.25)
+    np.testing.assert_allclose(matrix, expected, rtol=1e-6)
+    np.testing.assert_array_equal(matrix, compatibility.compatibility_matrix(left, right, tile_size=1000))
+
+
+@pytest.mark.parametrize('tile_size', [1, 7, 16, 1000])
+@pytest.mark.parametrize('k', [1, 5, 45, 100])
+def test_top_k_matches_the_full_matrix_for_every_tile_size(populations, tile_size, k):
+    left, right = populations
+    matrix = compatibility.compatibility_matrix(left, right)
+    expected_indexes, expected_scores = expected_top_k(matrix, min(k, len(right)))
+    indexes, scores = compatibility.top_k_matches(left, right, k=k, tile_size=tile_size)
+    np.testing.assert_array_equal(indexes, expected_indexes)
+    np.testing.assert_array_equal(scores, expected_scores)
+
+
+@pytest.mark.parametrize('tile_size', [7, 1000])
+def test_top_k_is_the_same_with_workers(populations, tile_size):
+    left, right = populations
+    single = compatibility.top_k_matches(left, right, k=8, tile_size=tile_size)
+    pooled = compatibility.top_k_matches(left, right, k=8, tile_size=tile_size, workers=2, rows_per_task=9)
+    np.testing.assert_array_equal(single[0], pooled[0])
+    np.testing.assert_array_equal(single[1], pooled[1])
+
+
+def test_custom_weights_and_edge_cases(populations):
+    left, right = populations
+    weights = {"Life Path": 1.0}
+    matrix = compatibility.compatibility_matrix(left, right, weights=weights)
+    table = compatibility.default_compatibility_table()
+    np.testing.assert_array_equal(matrix, table[left.codes[:, 0][:, None], right.codes[:, 0][None, :]])
+    indexes, scores = compatibility.top_k_matches(left[:0], right, k=3)
+    assert indexes.shape == (0, 3)
+    with pytest.raises(ValueError):
+        compatibility.top_k_matches(left, right, k=0)
+    with pytest.raises(ValueError):
+        compatibility.compatibility_matrix(left, right, weights={"Life Path": 0.0})
+
+
+def test_compute_profiles_uses_final_numbers():
+    profiles = compatibility.compute_profiles(['Jane Doe', 'Bob'], ['1990-05-17', 'not a date'])
+    results = nc.calculate_all_numerology('Jane Doe', '1990-05-17', with_log=False)
+    assert profiles.codes[0].tolist() == [compatibility.final_number_code(results[t]['number'])
+                                          for t in nc.NUMBER_TYPES]
+    assert profiles.codes[1, 0] == compatibility.MISSING_CODE
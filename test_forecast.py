@@ -0,0 +1,83 @@
+"""
+Forecast checks (python -m pytest -q): the vectorized Personal Year, Month and Day
+must match the digit-sum formulas reduced with the scalar reduce_number.
+"""
+import datetime
+import random
+
+import numpy as np
+import pytest
+
+import numerology_calculator_patched as nc
+import forecast as fc
+
+START = datetime.date(2027, 12, 20) # Crosses a year end and a leap day
+END = datetime.date(2028, 3, 3)
+
+
+def random_births(count, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.randint(1900, 2020)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" for _ in range(count)]
+
+
+def expected_totals(birth_date, day):
+    """Reference totals straight from the formulas in the module docstring."""
+    base = nc.sum_digits(birth_date.month) + nc.sum_digits(birth_date.day)
+    personal_year = base + nc.sum_digits(day.year)
+    personal_month = personal_year + nc.sum_digits(day.month)
+    personal_day = base + nc.sum_digits(day.year) + nc.sum_digits(day.month) + nc.sum_digits(day.day)
+    return dict(zip(fc.FORECAST_TYPES, (personal_year, personal_month, personal_day)))
+
+
+def test_forecast_matches_formulas():
+    births = random_births(60) + ['1999-12-29', datetime.date(1984, 11, 29), '2000-02-29']
+    result = fc.forecast(births, START, END)
+    assert result.rows == len(births)
+    assert len(result.dates) == (END - START).days + 1
+    for i, birth in enumerate(births):
+        birth_date = birth if isinstance(birth, datetime.date) else datetime.date.fromisoformat(birth)
+        for j, day in enumerate(result.dates.tolist()):
+            for number_type, total in expected_totals(birth_date, day).items():
+                final = nc.reduce_number(total)['final']
+                assert result.sums[number_type][i, j] == total, (birth, day, number_type)
+                assert result.strings(number_type)[i, j] == final, (birth, day, number_type)
+                assert result.numbers[number_type][i, j] == int(final.rsplit('/', 1)[-1])
+
+
+def test_invalid_births_give_error():
+    result = fc.forecast(['1990-02-30', 'abc', '1990-05-17'], START, START)
+    for number_type in fc.FORECAST_TYPES:
+        assert list(result.strings(number_type)[:2, 0]) == ['Error', 'Error']
+        assert (result.numbers[number_type][:2] == 0).all()
+        assert result.strings(number_type)[2, 0] != 'Error'
+
+
+@pytest.mark.parametrize('people_per_chunk, days_per_chunk', [(1, 1), (7, 10), (1000, 1000)])
+def test_iter_forecasts_chunks_cover_the_whole_forecast(people_per_chunk, days_per_chunk):
+    births = random_births(25, seed=1) + ['bad']
+    whole = fc.forecast(births, START, END)
+    for number_type in fc.FORECAST_TYPES:
+        assembled = np.zeros_like(whole.sums[number_type])
+        seen = np.zeros(assembled.shape, dtype=np.int64)
+        for chunk in fc.iter_forecasts(births, START, END, people_per_chunk, days_per_chunk):
+            day_start = int((chunk.dates[0] - whole.dates[0]).astype(int))
+            rows = slice(chunk.first_person, chunk.first_person + chunk.rows)
+            cols = slice(day_start, day_start + len(chunk.dates))
+            assembled[rows, cols] = chunk.sums[number_type]
+            seen[rows, cols] += 1
+        assert (seen == 1).all()
+        assert (assembled == whole.sums[number_type]).all()
+
+
+def test_personal_numbers_for_one_person():
+    target = datetime.date(2027, 1, 1)
+    results = fc.personal_numbers('1990-07-15', target)
+    for number_type, total in expected_totals(datetime.date(1990, 7, 15), target).items():
+        assert results[number_type] == {'number': nc.reduce_number(total)['final'], 'sum': total}
+    assert fc.personal_numbers('x', target) == {number_type: {'number': 'Error', 'sum': 0}
+                                                for number_type in fc.FORECAST_TYPES}
+
+
+def test_end_before_start_is_rejected():
+    with pytest.raises(ValueError):
+        fc.forecast(['1990-05-17'], END, START)
@@ -0,0 +1,98 @@
+"""Tests for the compiled interpretation store and its reloading."""
+import csv
+import mmap
+import os
+
+import pytest
+
+import interpretations_store
+
+
+def write_csv(path, texts):
+    with open(path, mode='w', encoding='utf-8', newline='') as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(['key', 'text'])
+        for number, text in texts.items():
+            writer.writerow([f"Numerology{number}", text])
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = str(tmp_path / 'interpretations.csv')
+    write_csv(path, {5: 'Five', 23: 'Twenty-three', 11: 'Interpretation pending'})
+    return path
+
+
+def touch_later(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_render_matches_render_blocks(csv_path):
+    store = interpretations_store.get_store(csv_path)
+    texts = interpretations_store.read_interpretations_csv(csv_path)
+
+    def get_text(part):
+        return texts.get(int(part))
+
+    for num_str in ('5', '23/5', '11', '29/11', '7'):
+        assert store.render(num_str) == interpretations_store.render_blocks(num_str, get_text)
+    assert store.is_placeholder('11') and store.is_placeholder(7) and not store.is_placeholder('5')
+
+
+def test_second_load_memory_maps_the_compiled_file(csv_path):
+    interpretations_store.build_store(csv_path)
+    store = interpretations_store.load_store(csv_path)
+    assert isinstance(store._buffer, mmap.mmap)
+    assert store.get_text(5) == 'Five'
+    assert [name for name in os.listdir(os.path.dirname(csv_path)) if name.endswith('.tmp')] == []
+
+
+def test_staleness_follows_mtime_and_size(csv_path):
+    store = interpretations_store.get_store(csv_path)
+    assert not store.is_stale()
+    assert interpretations_store.get_store(csv_path) is store
+    touch_later(csv_path)
+    assert store.is_stale()
+    reloaded = interpretations_store.get_store(csv_path)
+    assert reloaded is not store and not reloaded.is_stale()
+
+    write_csv(csv_path, {5: 'Five, revised'})
+    assert reloaded.is_stale()
+    assert interpretations_store.get_store(csv_path).get_text(5) == 'Five, revised'
+
+
+def test_stale_compiled_file_is_rebuilt(csv_path):
+    interpretations_store.build_store(csv_path)
+    write_csv(csv_path, {5: 'Changed text of another length'})
+    touch_later(csv_path)
+    assert interpretations_store.load_store(csv_path).get_text(5) == 'Changed text of another length'
+
+
+def test_corrupt_compiled_file_is_rebuilt(csv_path):
+    with open(interpretations_store.default_compiled_path(csv_path), 'wb') as outfile:
+        outfile.write(b'garbage')
+    assert interpretations_store.load_store(csv_path).get_text(23) == 'Twenty-three'
+
+
+def test_held_store_stays_usable_after_a_reload(csv_path):
+    interpretations_store.build_store(csv_path)
+    interpretations_store._stores.clear()
+    held = interpretations_store.get_store(csv_path)
+    assert isinstance(held._buffer, mmap.mmap)
+    expected = held.render('23/5')
+    held._rendered.clear() # Force reading from the memory map again
+
+    write_csv(csv_path, {5: 'New five', 23: 'New twenty-three'})
+    touch_later(csv_path)
+    reloaded = interpretations_store.get_store(csv_path)
+    assert reloaded is not held
+    assert held.render('23/5') == expected
+    assert reloaded.get_text(5) == 'New five'
+
+
+def test_missing_columns_raise_format_error(tmp_path):
+    path = tmp_path / 'bad.csv'
+    path.write_text('a,b\n1,2\n', encoding='utf-8')
+    with pytest.raises(interpretations_store.InterpretationFormatError):
+        interpretations_store.get_store(str(path))
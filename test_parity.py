@@ -0,0 +1,225 @@
+"""
+Parity checks for the optimized calculators (pip install -r requirements-dev.txt, then python -m pytest -q).
+
+The reference functions below are the original scalar calculators, kept as they
+were before the lookup tables, lazy logs, caches and batch engine were added
+(reduction and the Y rule use the unchanged _reduce_number_rules and is_y_vowel).
+The scalar calculators must reproduce their results and logs exactly, and the
+batch calculators must reproduce the scalar results.
+"""
+import datetime
+import random
+import re
+import threading
+
+import numpy as np
+import pytest
+
+import numerology_calculator_patched as nc
+import name_normalization
+import numerology_systems
+import bulk_cli
+
+Y_NAMES = ['Y', 'YY', 'YYY', 'AY', 'YA', 'BY', 'YB', 'BYB', 'AYA', 'BYA', 'AYB', 'Mary', 'Lynn',
+           'Yvonne', 'Kyle Ryan', 'Sky Lyy', 'Y-Y y.y', 'Bryan Yates', 'Yolanda Ybarra']
+EDGE_NAMES = ['', ' ', '123', "O'Brien-Smith", 'jane doe', 'Jane  Doe\t', 'Z' * 1500, 'Q' * 1300]
+NON_ASCII_NAMES = ['José García', 'Straße', 'Ærø Łódź', 'François Müller', 'Ångström', 'Ŋgozi',
+                   'ﬁona', 'Ｊａｎｅ', 'Björk Guðmundsdóttir', '李小龍', 'Zoë Yñez', 'ı']
+NUL_NAMES = ['Ann\x00Lee', 'Bob', 'Cy', '\x00', 'A\x00\x00Y']
+DATES = ['1990-05-17', '2000-02-29', '1900-02-29', '2001-02-29', '1990-13-01', '1990-00-10',
+         '1990-04-31', '0001-01-01', '9999-12-31', '1990-1-5', '1990-01-5', '19900101', '1990/01/01',
+         ' 1990-01-01', '1990-01-01 ', 'abc', '', '+1990-01-01', '1990-01-01T00:00']
+
+
+# --- Reference (original) calculators ---
+
+def reference_name_number(kind, name):
+    clean_name = re.sub(r'[^A-Z]', '', name.upper())
+    total = 0
+    log = [f"Calculating {kind} for: {name} -> {clean_name}"]
+    for i, letter in enumerate(clean_name):
+        value = nc.letter_values.get(letter, 0)
+        is_vowel = letter in nc.VOWELS or (letter == 'Y' and nc.is_y_vowel(clean_name, i))
+        if kind == 'Expression':
+            total += value
+            log.append(f"  '{letter}' = {value}")
+        elif kind == 'Soul Urge':
+            total += value if is_vowel else 0
+            log.append(f"  '{letter}' (Vowel) = {value}" if is_vowel else f"  '{letter}' (Consonant) skipped")
+        else:
+            total += 0 if is_vowel else value
+            log.append(f"  '{letter}' (Vowel) skipped" if is_vowel else f"  '{letter}' (Consonant) = {value}")
+    log.append(f"  Total Sum = {total}")
+    reduction_result = nc._reduce_number_rules(total)
+    log.append(reduction_result['log'])
+    return {'number': reduction_result['final'], 'sum': total, 'log': "\n".join(log)}
+
+
+def reference_life_path(birth_date_str):
+    log = [f"Calculating Life Path for: {birth_date_str}"]
+    try:
+        if isinstance(birth_date_str, datetime.date):
+            birth_date = birth_date_str
+        else:
+            birth_date = datetime.datetime.strptime(birth_date_str, '%Y-%m-%d').date()
+        year, month, day = birth_date.year, birth_date.month, birth_date.day
+        log.append(f"  Date parsed: Year={year}, Month={month}, Day={day}")
+        total = sum(int(d) for d in str(year)) + sum(int(d) for d in str(month)) + sum(int(d) for d in str(day))
+        log.append(f"  Digits sum ({year}+{month}+{day}): {total}")
+        reduction_result = nc._reduce_number_rules(total)
+        log.append(reduction_result['log'])
+        return {'number': reduction_result['final'], 'sum': total, 'log': "\n".join(log)}
+    except ValueError:
+        log.append("  Error: Invalid date format. Please use YYYY-MM-DD.")
+        return {'number': 'Error', 'sum': 0, 'log': "\n".join(log)}
+
+
+def random_names(count, seed=0):
+    rng = random.Random(seed)
+    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyzYYYYyy  -.\''
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))) for _ in range(count)]
+
+
+def random_dates(count, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.randint(1, 9999):04d}-{rng.randint(0, 13):02d}-{rng.randint(0, 32):02d}" for _ in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    nc.configure_caches()
+    yield
+    nc.configure_caches()
+
+
+# --- Scalar calculators against the reference ---
+
+@pytest.mark.parametrize('kind, calculator', [('Expression', nc.calculate_expression),
+                                              ('Soul Urge', nc.calculate_soul_urge),
+                                              ('Personality', nc.calculate_personality)])
+def test_name_numbers_match_reference_with_logs(kind, calculator):
+    for name in Y_NAMES + EDGE_NAMES + random_names(2000):
+        for _ in range(2): # Second call is served from the name cache
+            assert calculator(name) == reference_name_number(kind, name), name
+            assert calculator(name, as_record=True).to_dict() == reference_name_number(kind, name), name
+
+
+def test_life_path_matches_reference_with_logs():
+    dates = DATES + random_dates(3000) + [datetime.date(1984, 7, 4), datetime.date(2024, 2, 29)]
+    for birth_date in dates:
+        for _ in range(2): # Second call is served from the date cache
+            assert nc.calculate_life_path(birth_date) == reference_life_path(birth_date), birth_date
+
+
+def test_reduce_number_matches_rules_inside_and_outside_the_table():
+    for num in list(range(0, 3000)) + list(range(nc.REDUCTION_TABLE_SIZE - 50, nc.REDUCTION_TABLE_SIZE + 50)) + \
+            [123456, 10 ** 9 + 7, -1, -3, 2.5, 0.0, 'x']:
+        assert nc.reduce_number(num) == nc._reduce_number_rules(num), num
+
+
+def test_reduction_details_rejects_invalid_input_like_reduce_number():
+    for num in (-3, 2.5, 'x'):
+        assert nc.reduction_details(num).number == nc.reduce_number(num)['final'] == 'Invalid Input'
+    for num in (0, 29, 199, 38888, 10 ** 7 + 5):
+        result = nc.reduce_number(num)
+        details = nc.reduction_details(num)
+        assert (details.number, details.r1, details.r2, details.r3) == \
+            (result['final'], result['r1'], result['r2'], result['r3'])
+
+
+def test_non_ascii_names_score_like_their_folded_form():
+    for name in NON_ASCII_NAMES:
+        folded = name_normalization.normalize_name(name)
+        assert folded.isascii() and folded.isalpha() or folded == ''
+        for kind, calculator in (('Expression', nc.calculate_expression), ('Soul Urge', nc.calculate_soul_urge),
+                                 ('Personality', nc.calculate_personality)):
+            result = calculator(name, with_log=False)
+            reference = reference_name_number(kind, folded)
+            assert (result['number'], result['sum']) == (reference['number'], reference['sum']), name
+
+
+# --- Batch calculators against the scalar calculators ---
+
+def assert_batch_matches_scalar(names, dates):
+    batch = nc.calculate_all_numerology_batch(names, dates)
+    for number_type in nc.NUMBER_TYPES:
+        assert len(batch[number_type]['number']) == len(names)
+    for i, (name, birth_date) in enumerate(zip(names, dates)):
+        scalar = nc.calculate_all_numerology(name, birth_date, with_log=False)
+        for number_type in nc.NUMBER_TYPES:
+            assert batch[number_type]['number'][i] == scalar[number_type]['number'], (name, birth_date)
+            assert batch[number_type]['sum'][i] == scalar[number_type]['sum'], (name, birth_date)
+
+
+def test_batch_matches_scalar_for_ascii_names_and_dates():
+    names = Y_NAMES + EDGE_NAMES + random_names(3000, seed=1)
+    dates = (DATES * len(names))[:len(names) // 2] + random_dates(len(names) - len(names) // 2, seed=1)
+    assert_batch_matches_scalar(names, dates)
+
+
+def test_batch_matches_scalar_for_non_ascii_and_nul_names():
+    names = NON_ASCII_NAMES + NUL_NAMES + Y_NAMES
+    assert_batch_matches_scalar(names, ['1990-05-17'] * len(names))
+
+
+def test_nul_in_a_name_does_not_shift_later_rows():
+    rows = bulk_cli.calculate_chunk(0, [('Ann\x00Lee', '1990-05-17'), ('Bob', '1990-05-17'), ('Cy', '1990-05-17')])
+    assert [row['expression'] for row in rows] == \
+        [nc.calculate_expression(name, with_log=False)['number'] for name in ('Ann\x00Lee', 'Bob', 'Cy')]
+
+
+def test_batch_accepts_datetime64_dates():
+    days = np.arange(np.datetime64('1899-12-25'), np.datetime64('1900-03-05'))
+    batch = nc.calculate_life_path_batch(days)
+    for i, day in enumerate(days.tolist()):
+        assert batch['number'][i] == nc.calculate_life_path(day.isoformat(), with_log=False)['number']
+
+
+@pytest.mark.parametrize('system', ['pythagorean', 'chaldean'])
+def test_name_numbers_batch_matches_scalar_per_system(system):
+    names = Y_NAMES + NON_ASCII_NAMES + NUL_NAMES + random_names(500, seed=2)
+    batch = nc.calculate_name_numbers_batch(names, [system])[system]
+    for i, name in enumerate(names):
+        scalar = nc.calculate_name_numbers(name, [system])[system]
+        for number_type in nc.NAME_NUMBER_TYPES:
+            assert batch[number_type]['number'][i] == scalar[number_type]['number'], name
+            assert batch[number_type]['sum'][i] == scalar[number_type]['sum'], name
+
+
+def test_scalar_calculators_use_the_system_reduction():
+    system = numerology_systems.NumerologySystem('single_digit_test', nc.letter_values, reduction='single_digit')
+    calculators = {'Expression': nc.calculate_expression, 'Soul Urge': nc.calculate_soul_urge,
+                   'Personality': nc.calculate_personality}
+    for name in ['Jane', 'Kyle Ryan', 'Bryan Yates'] + random_names(300, seed=3):
+        expected = nc.calculate_name_numbers(name, [system])[system.name]
+        analysis = nc.analyze_name(name, system)
+        for number_type, calculator in calculators.items():
+            result = calculator(name, analysis=analysis)
+            assert (result['number'], result['sum']) == \
+                (expected[number_type]['number'], expected[number_type]['sum']), name
+            assert result['log'].endswith(f"Single-digit reduction (single_digit_test). Final: {result['number']}")
+    assert nc.calculate_expression('Jane', analysis=nc.analyze_name('Jane', system))['number'] == '12/3'
+
+
+def test_lru_cache_is_safe_across_threads():
+    cache = nc.LRUCache(8)
+    errors = []
+
+    def hammer(offset):
+        try:
+            for i in range(20000):
+                key = (i * 7 + offset) % 24
+                if cache.get(key) is None:
+                    cache.put(key, key)
+        except Exception as e: # A race would surface as KeyError here
+            errors.append(e)
+
+    threads = [threading.Thread(target=hammer, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(cache) <= 8
+    stats = cache.stats()
+    assert stats['hits'] + stats['misses'] == 8 * 20000
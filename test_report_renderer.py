@@ -0,0 +1,122 @@
+"""Tests for report layout, HTML rendering and the bulk report archive."""
+import csv
+import importlib.util
+import zipfile
+
+import pytest
+
+import numerology_calculator_patched as nc
+import interpretations_store
+import report_renderer
+
+RECORDS = [('Jane Doe', '1990-05-17'), ('José Núñez', '1984-11-29'), ('<b>Bob</b> & Co', '2000-02-29'),
+           ('Bad Date', '1990-02-30'), ('', '1975-01-01'), ('Mary Lynn', '1969-07-20'), ('Kyle Ryan', '2001-09-11')]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = str(tmp_path / 'interpretations.csv')
+    with open(path, mode='w', encoding='utf-8', newline='') as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(['key', 'text'])
+        for number in range(1, 100):
+            writer.writerow([f"Numerology{number}", f"Text for **{number}** & more.\n\n---\n\nSecond part."])
+    return path
+
+
+def test_build_report_follows_the_calculators(csv_path):
+    store = interpretations_store.get_store(csv_path)
+    report = report_renderer.build_report('Jane Doe', '1990-05-17', store)
+    results = nc.calculate_all_numerology('Jane Doe', '1990-05-17')
+    assert [section['number_name'] for section in report['sections']] == list(nc.NUMBER_TYPES)
+    for section in report['sections']:
+        expected = results[section['number_name']]
+        assert (section['number'], section['sum'], section['log']) == \
+            (expected['number'], expected['sum'], expected['log'])
+        assert section['interpretations'] == store.render(section['number'])
+        assert not section['interpretations_missing']
+
+
+def test_build_report_without_store_marks_interpretations_missing():
+    report = report_renderer.build_report('Jane Doe', '1990-02-30', None)
+    by_name = {section['number_name']: section for section in report['sections']}
+    assert by_name['Life Path']['number'] == 'Error'
+    assert not by_name['Life Path']['interpretations_missing'] # Nothing to interpret
+    assert by_name['Expression']['interpretations_missing']
+    assert by_name['Expression']['interpretations'] == []
+
+
+def test_build_reports_without_logs_matches_scalar_reports(csv_path):
+    store = interpretations_store.get_store(csv_path)
+    batch = report_renderer.build_reports(RECORDS, store, include_logs=False)
+    for (name, birth_date), report in zip(RECORDS, batch):
+        scalar = report_renderer.build_report(name, birth_date, store, include_logs=False)
+        for section, expected in zip(report['sections'], scalar['sections']):
+            assert (section['number'], section['sum'], section['interpretations']) == \
+                (expected['number'], expected['sum'], expected['interpretations']), name
+
+
+def test_html_escapes_input_and_renders_interpretations(csv_path):
+    renderer = report_renderer.ReportRenderer(interpretations_store.get_store(csv_path), include_logs=True)
+    page = renderer.html(renderer.report('<b>Bob</b> & Co', '2000-02-29'))
+    assert '<b>Bob</b>' not in page and '&lt;b&gt;Bob&lt;/b&gt; &amp; Co' in page
+    assert '<strong>' in page and '<hr>' in page and '&amp; more.' in page
+    assert page.count('<details>') == len(nc.NUMBER_TYPES)
+    without_logs = report_renderer.ReportRenderer(None, include_logs=False)
+    page = without_logs.html(without_logs.report('Jane Doe', '1990-05-17'))
+    assert '<details>' not in page
+    assert page.count('class="warning"') == len(nc.NUMBER_TYPES)
+
+
+def test_markdown_to_html():
+    assert report_renderer.markdown_to_html("**Hi** <you>\nthere\n\n---\n\nEnd") == \
+        "<p><strong>Hi</strong> &lt;you&gt;<br>\nthere</p>\n<hr>\n<p>End</p>"
+
+
+def test_report_filename():
+    assert report_renderer.report_filename(42, 'José Núñez') == '000042-jose-nunez.html'
+    assert report_renderer.report_filename(1, '', 'pdf') == '000001-report.pdf'
+
+
+def read_archive(path):
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def test_archive_is_the_same_for_any_worker_count(tmp_path, csv_path):
+    records = RECORDS * 3
+    single = str(tmp_path / 'single.zip')
+    pooled = str(tmp_path / 'pooled.zip')
+    assert report_renderer.write_report_archive(records, single, csv_path, workers=1, chunk_size=4) == len(records)
+    assert report_renderer.write_report_archive(records, pooled, csv_path, workers=2, chunk_size=4) == len(records)
+    files = read_archive(single)
+    assert files == read_archive(pooled)
+    assert sorted(files) == [report_renderer.report_filename(i, name) for i, (name, _) in enumerate(records)]
+
+    renderer = report_renderer.ReportRenderer(interpretations_store.get_store(csv_path))
+    name, birth_date = records[1]
+    assert files[report_renderer.report_filename(1, name)] == renderer.render(renderer.report(name, birth_date))
+
+
+def test_archive_rejects_bad_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        report_renderer.write_report_archive(RECORDS, str(tmp_path / 'out.zip'), None, fmt='docx')
+    with pytest.raises(FileNotFoundError):
+        report_renderer.write_report_archive(RECORDS, str(tmp_path / 'out.zip'), str(tmp_path / 'missing.csv'))
+
+
+@pytest.mark.skipif(importlib.util.find_spec('weasyprint') is not None, reason="weasyprint is installed")
+def test_pdf_without_weasyprint_raises_runtime_error(tmp_path):
+    with pytest.raises(RuntimeError, match='pip install weasyprint'):
+        report_renderer.write_report_archive(RECORDS, str(tmp_path / 'out.zip'), None, fmt='pdf')
+
+
+def test_main_writes_an_archive(tmp_path, csv_path):
+    input_path = tmp_path / 'people.csv'
+    input_path.write_text("name,birth_date\nJane Doe,1990-05-17\nMary Lynn,1969-07-20\n", encoding='utf-8')
+    output_path = str(tmp_path / 'reports.zip')
+    assert report_renderer.main([str(input_path), output_path, '--interpretations', csv_path,
+                                 '--workers', '1', '--no-log']) == 0
+    assert sorted(read_archive(output_path)) == ['000000-jane-doe.html', '000001-mary-lynn.html']
+    assert report_renderer.main([str(input_path), output_path, '--interpretations',
+                                 str(tmp_path / 'missing.csv'), '--workers', '1']) == 1
@@ -0,0 +1,106 @@
+"""Tests for the reverse-lookup indexes."""
+import datetime
+
+import numpy as np
+import pytest
+
+import numerology_calculator_patched as nc
+import reverse_index
+
+NAMES = ['Jane Doe', 'John Smith', 'Mary Lynn', 'José García', 'Ann Lee', 'Bob', '', 'Yvonne Ybarra',
+         'Kyle Ryan', 'Zoë Adams', 'Ann Lee', 'Q' * 1300]
+
+
+@pytest.fixture(scope='module')
+def date_index():
+    return reverse_index.DateIndex(datetime.date(2026, 11, 1), datetime.date(2028, 2, 29))
+
+
+def life_paths(start, end):
+    day = start
+    while day <= end:
+        yield day, nc.calculate_life_path(day.isoformat(), with_log=False)['number']
+        day += datetime.timedelta(days=1)
+
+
+def test_date_query_matches_the_calculator(date_index):
+    start, end = datetime.date(2027, 1, 1), datetime.date(2027, 12, 31)
+    expected = [day for day, number in life_paths(start, end) if number in ('22', '11')]
+    assert expected
+    assert date_index.query(['22', '11'], start=start, end=end) == expected
+    assert date_index.query('22') == [day for day, number in life_paths(date_index.start, date_index.end)
+                                      if number == '22']
+
+
+def test_date_query_final_part(date_index):
+    expected = [day for day, number in life_paths(date_index.start, date_index.end)
+                if number.rsplit('/', 1)[-1] == '5']
+    assert date_index.query(['5'], final_part=True) == expected
+    assert date_index.query(['no such number']) == []
+
+
+def test_date_index_save_load_round_trip(date_index, tmp_path):
+    path = str(tmp_path / 'dates.npz')
+    date_index.save(path)
+    loaded = reverse_index.DateIndex.load(path)
+    assert (loaded.start, loaded.end) == (date_index.start, date_index.end)
+    assert loaded.counts() == date_index.counts()
+    np.testing.assert_array_equal(loaded.query_ids(['22', '33']), date_index.query_ids(['22', '33']))
+    with pytest.raises(ValueError):
+        reverse_index.NameIndex.load(path)
+
+
+def expected_names(names, number_type, numbers):
+    calculators = {"Expression": nc.calculate_expression, "Soul Urge": nc.calculate_soul_urge,
+                   "Personality": nc.calculate_personality}
+    return [i for i, name in enumerate(names)
+            if calculators[number_type](name, with_log=False)['number'] in numbers]
+
+
+@pytest.mark.parametrize('number_type', list(nc.NAME_NUMBER_TYPES))
+def test_name_query_matches_the_calculator(number_type):
+    index = reverse_index.NameIndex(NAMES)
+    for name in NAMES:
+        number = nc.calculate_all_numerology(name, '2000-01-01', with_log=False)[number_type]['number']
+        ids = index.query_ids(number_type, [number]).tolist()
+        assert ids == expected_names(NAMES, number_type, [number])
+        assert index.query(number_type, [number]) == [NAMES[i] for i in ids]
+
+
+def test_incremental_add_names_matches_a_single_build():
+    whole = reverse_index.NameIndex(NAMES)
+    grown = reverse_index.NameIndex(NAMES[:5])
+    added = grown.add_names(NAMES[5:])
+    assert added == range(5, len(NAMES)) and len(grown) == len(NAMES)
+    for number_type in nc.NAME_NUMBER_TYPES:
+        assert grown.counts(number_type) == whole.counts(number_type)
+        for key in whole.counts(number_type):
+            np.testing.assert_array_equal(grown.query_ids(number_type, [key]), whole.query_ids(number_type, [key]))
+
+
+def test_name_query_id_range():
+    index = reverse_index.NameIndex(NAMES)
+    number = nc.calculate_expression('Ann Lee', with_log=False)['number']
+    added = index.add_names(['Ann Lee', 'Zed'])
+    assert index.query('Expression', [number], id_range=added) == \
+        [name for name in ['Ann Lee', 'Zed'] if nc.calculate_expression(name, with_log=False)['number'] == number]
+    everything = index.query_ids('Expression', [number])
+    assert len(everything) == 3 # 'Ann Lee' twice in NAMES and once more added
+    assert index.query_ids('Expression', [number], id_range=range(0, 0)).tolist() == []
+    assert index.query_ids('Expression', [number], id_range=range(0, len(index))).tolist() == everything.tolist()
+    assert index.query_ids('Expression', [number], id_range=range(0, 5)).tolist() == [4]
+    with pytest.raises(ValueError):
+        index.query('Life Path', [number])
+
+
+def test_name_index_save_load_round_trip(tmp_path):
+    index = reverse_index.NameIndex(NAMES)
+    path = str(tmp_path / 'names.npz')
+    index.save(path)
+    loaded = reverse_index.NameIndex.load(path)
+    assert loaded.names == index.names
+    for number_type in nc.NAME_NUMBER_TYPES:
+        assert loaded.counts(number_type) == index.counts(number_type)
+    loaded.add_names(['Jane Doe'])
+    assert loaded.query_ids('Expression', [nc.calculate_expression('Jane Doe', with_log=False)['number']])[-1] == \
+        len(NAMES)